@@ -3,86 +3,133 @@ Edmonds' Blossom Algorithm (Optimized) – Unweighted Maximum Cardinality Matchi
 
 Forest BFS: each stage labels ALL free vertices as S-roots simultaneously
 and grows a search forest. An augmenting path is found when two different
-trees meet (S-S edge across trees). One augmentation per stage, then
-expand all blossoms and repeat until no augmenting path exists.
+trees meet (S-S edge across trees). Both trees are then frozen and the
+search goes on in the rest of the forest, so one stage augments along a
+set of vertex-disjoint paths. Then expand all blossoms and repeat until
+a stage finds no augmenting path.
 
 Same blossom machinery as edmonds-simple (NetworkX-derived), just with
 forest search instead of single-source tree search.
 
-Complexity: O(V * E) worst case (one stage per augmentation, each stage O(E)).
+Complexity: O(V * E) worst case (at most one stage per augmentation, each
+stage O(E)).
 
-Python implementation – faithful translation of the C++ version.
+Python implementation – derived from the C++ version, which it follows
+for the blossom machinery. Python-only divergences:
+- each stage augments several vertex-disjoint paths (trees are frozen
+  via tree_root/dead), where C++ stops at its first augmentation;
+- the queue is scanned FIFO (C++ pops it as a LIFO stack).
 """
 
 import sys
 import time
+from bisect import bisect_left
 
 NIL = -1
 
 
 class Blos:
-    __slots__ = ('childs', 'edges')
+    __slots__ = ('childs', 'edges', 'leaves')
     def __init__(self):
         self.childs = []
         self.edges = []
+        self.leaves = None  # cached leaf list; None = recompute on demand
 
 
 class Solver:
     def __init__(self, n, edges):
         self.n = n
-        self.adj = [[] for _ in range(n)]
+        adj = [[] for _ in range(n)]
         for u, v in edges:
             if u != v and 0 <= u < n and 0 <= v < n:
-                self.adj[u].append(v)
-                self.adj[v].append(u)
+                adj[u].append(v)
+                adj[v].append(u)
+
+        # CSR adjacency: neighbors of v are edges[adj_start[v]:adj_start[v + 1]]
+        # Per-vertex sorted(set()) runs entirely in C on short lists; one
+        # global sort of packed u*n+v keys plus a dedup pass measured ~2x
+        # slower in CPython, so dedup stays per vertex.
+        self.adj_start = [0] * (n + 1)
+        self.edges = []
         for i in range(n):
-            self.adj[i] = sorted(set(self.adj[i]))
+            self.edges.extend(sorted(set(adj[i])))
+            self.adj_start[i + 1] = len(self.edges)
 
         self.mate = [NIL] * n
 
         # Blossom storage. IDs 0..n-1 are trivial (one vertex each).
-        # Non-trivial blossoms have id in [n, nblos).
+        # Non-trivial blossoms have id in [n, nblos). Every blossom merges
+        # at least three top-level blossoms, so nblos < 2n and all
+        # blossom-indexed arrays are sized 2n once, up front.
+        # Blos objects form a pool: slots are created the first time an id is
+        # reached and then reused by later stages instead of reallocated.
         self.blos = [None] * n  # slots 0..n-1 unused; extended as needed
         self.nblos = n
 
         self.inblossom = list(range(n))
-        self.blossomparent = [NIL] * n
-        self.blossombase = list(range(n))
-
-        # Per-search state (resized in ensure / reset_blossoms)
-        self.label = []
-        self.labeledge = []
+        self.blossomparent = [NIL] * (2 * n)
+        self.blossombase = list(range(n)) + [NIL] * n
+        # Top-level non-trivial blossoms of the current search, so the
+        # end-of-search expansion skips nested ids. top_pos[b] is b's index
+        # in top_blossoms, for O(1) swap-removal when b gets nested.
+        self.top_blossoms = []
+        self.top_pos = [0] * (2 * n)
+
+        # Per-search state (reset in reset_blossoms). Labels are 0/1/2 (free/S/T)
+        # and fit in a bytearray. The labeling edge of b is
+        # (le_src[b], le_dst[b]), kept as two int lists so that labeling
+        # stores scalars instead of building a tuple.
+        self.label = bytearray(2 * n)
+        self.le_src = [NIL] * (2 * n)
+        self.le_dst = [NIL] * (2 * n)
         self.queue = []
 
-        self.greedy_size = 0
+        # Forest bookkeeping: tree_root[v] is the root of v's tree (valid
+        # while v is labeled); dead[r] marks trees already augmented this stage.
+        self.tree_root = [NIL] * n
+        self.dead = bytearray(n)
+
+        # scan_blossom breadcrumbs: b is on the current trail iff
+        # scan_mark[b] == scan_epoch, so no per-call clear is needed.
+        self.scan_mark = [0] * (2 * n)
+        self.scan_epoch = 0
+
+        # Frame stacks for expand_blossom / augment_blossom, one int list
+        # per frame field, indexed by a top counter. Frames always form a
+        # chain of nested blossoms and k nested blossoms hold at least
+        # 2k+1 vertices, so n//2 + 1 slots are enough.
+        depth = n // 2 + 1
+        self.ex_b = [0] * depth
+        self.ex_end = [False] * depth
+        self.ex_idx = [0] * depth
+        self.au_b = [0] * depth
+        self.au_v = [0] * depth
+        self.au_phase = [0] * depth
+        self.au_i = [0] * depth
+        self.au_j = [0] * depth
+        self.au_jstep = [0] * depth
 
-    def ensure(self, b):
-        if b < len(self.label):
-            return
-        old = len(self.label)
-        self.label.extend([0] * (b + 1 - old))
-        self.labeledge.extend([(NIL, NIL)] * (b + 1 - old))
-        while len(self.blossomparent) <= b:
-            self.blossomparent.append(NIL)
-        while len(self.blossombase) <= b:
-            self.blossombase.append(NIL)
-
-    def is_blossom(self, b):
-        return b >= self.n
+        self.greedy_size = 0
 
     def leaves(self, b):
-        """Yield all vertices (leaf nodes) inside blossom b."""
-        if not self.is_blossom(b):
+        """Return all vertices (leaf nodes) inside blossom b. The list is
+        cached on the blossom; callers must not modify it."""
+        n = self.n
+        if b < n:
             return [b]
+        bl = self.blos[b]
+        if bl.leaves is not None:
+            return bl.leaves
         result = []
         stack = [b]
         while stack:
             x = stack.pop()
-            if not self.is_blossom(x):
+            if x < n:
                 result.append(x)
             else:
                 for c in self.blos[x].childs:
                     stack.append(c)
+        bl.leaves = result
         return result
 
     # ---- Reset for a new BFS ----
@@ -90,32 +137,39 @@ class Solver:
     def reset_blossoms(self):
         n = self.n
         self.nblos = n
-        self.blos = self.blos[:n]
-        for i in range(n):
-            self.inblossom[i] = i
-            self.blossombase[i] = i
-            self.blossomparent[i] = NIL
-        self.label = [0] * n
-        self.labeledge = [(NIL, NIL)] * n
+        # Bulk slice stores run in C instead of 3n interpreted item stores
+        self.inblossom[:] = range(n)
+        self.blossombase[:n] = range(n)
+        self.blossomparent[:n] = [NIL] * n
+        self.label = bytearray(2 * n)
+        self.le_src = [NIL] * (2 * n)
+        self.le_dst = [NIL] * (2 * n)
         self.queue = []
+        self.dead = bytearray(n)
 
     # ---- Tree building ----
 
     def assign_label(self, w, t, v):
         b = self.inblossom[w]
-        self.ensure(b)
         self.label[b] = t
         self.label[w] = t
+        self.le_src[w] = self.le_src[b] = v
         if v != NIL:
-            self.labeledge[w] = self.labeledge[b] = (v, w)
+            self.le_dst[w] = self.le_dst[b] = w
+            r = self.tree_root[v]
         else:
-            self.labeledge[w] = self.labeledge[b] = (NIL, NIL)
+            self.le_dst[w] = self.le_dst[b] = NIL
+            r = w
+        tree_root = self.tree_root
         if t == 1:
             # S-blossom: add its leaves to the BFS queue
             for u in self.leaves(b):
+                tree_root[u] = r
                 self.queue.append(u)
         elif t == 2:
             # T-blossom: label the mate of its base as S
+            for u in self.leaves(b):
+                tree_root[u] = r
             base = self.blossombase[b]
             self.assign_label(self.mate[base], 1, base)
 
@@ -124,29 +178,27 @@ class Solver:
     def scan_blossom(self, v, w):
         """Trace from two S-vertices to find their LCA (blossom base).
         Returns base vertex, or -2 if different trees."""
-        path = []
+        self.scan_epoch += 1
+        ep = self.scan_epoch
+        mark = self.scan_mark
+        le_src = self.le_src
         base = -2
         while v != -2 or w != -2:
             if v != -2:
                 b = self.inblossom[v]
-                if self.label[b] & 4:
+                if mark[b] == ep:
                     base = self.blossombase[b]
                     break
-                path.append(b)
-                self.label[b] = 5  # breadcrumb
-                le = self.labeledge[b]
-                if le[0] == NIL:
+                mark[b] = ep  # breadcrumb
+                t = le_src[b]
+                if t == NIL:
                     v = -2  # reached root
                 else:
-                    v = le[0]
-                    bt = self.inblossom[v]
-                    v = self.labeledge[bt][0]
+                    v = le_src[self.inblossom[t]]
                 if w != -2:
                     v, w = w, v
             else:
                 v, w = w, v
-        for b in path:
-            self.label[b] = 1  # restore breadcrumbs
         return base
 
     # ---- Blossom contraction ----
@@ -159,15 +211,16 @@ class Solver:
         bid = self.nblos
         self.nblos += 1
         if bid >= len(self.blos):
-            self.blos.append(Blos())
+            bl = Blos()
+            self.blos.append(bl)
         else:
-            self.blos[bid] = Blos()
-        self.ensure(bid)
+            bl = self.blos[bid]  # pooled; emptied when last expanded
+            bl.childs.clear()
+            bl.edges.clear()
         self.blossombase[bid] = base
         self.blossomparent[bid] = NIL
         self.blossomparent[bb] = bid
 
-        bl = self.blos[bid]
         bl.edges.append((v, w))  # bridge edge
 
         # Trace from v back to base
@@ -176,8 +229,8 @@ class Solver:
         while bcv != bb:
             self.blossomparent[bcv] = bid
             bl.childs.append(bcv)
-            bl.edges.append(self.labeledge[bcv])
-            cv = self.labeledge[bcv][0]
+            cv = self.le_src[bcv]
+            bl.edges.append((cv, self.le_dst[bcv]))
             bcv = self.inblossom[cv]
         bl.childs.append(bb)
         bl.childs.reverse()
@@ -189,16 +242,38 @@ class Solver:
         while bcw != bb:
             self.blossomparent[bcw] = bid
             bl.childs.append(bcw)
-            le = self.labeledge[bcw]
-            bl.edges.append((le[1], le[0]))  # reversed
-            cw = self.labeledge[bcw][0]
+            cw = self.le_src[bcw]
+            bl.edges.append((self.le_dst[bcw], cw))  # reversed
             bcw = self.inblossom[cw]
 
         self.label[bid] = 1
-        self.labeledge[bid] = self.labeledge[bb]
+        self.le_src[bid] = self.le_src[bb]
+        self.le_dst[bid] = self.le_dst[bb]
+
+        # Leaf list from the children's: the new blossom takes them over and
+        # the children drop their copies (rebuilt only if they resurface).
+        n = self.n
+        top = self.top_blossoms
+        top_pos = self.top_pos
+        lv = []
+        for c in bl.childs:
+            if c < n:
+                lv.append(c)
+            else:
+                lv.extend(self.leaves(c))
+                self.blos[c].leaves = None
+                # c is nested now: swap-remove it from top_blossoms
+                i = top_pos[c]
+                last = top.pop()
+                if last != c:
+                    top[i] = last
+                    top_pos[last] = i
+        bl.leaves = lv
+        top_pos[bid] = len(top)
+        top.append(bid)
 
         # Relabel: T-vertices inside the blossom become S
-        for u in self.leaves(bid):
+        for u in lv:
             if self.label[self.inblossom[u]] == 2:
                 self.queue.append(u)
             self.inblossom[u] = bid
@@ -206,19 +281,31 @@ class Solver:
     # ---- Blossom expansion ----
 
     def expand_blossom(self, b, endstage):
-        stack = [(b, endstage, 0)]
-
-        while stack:
-            fb, fend, fidx = stack[-1]
+        # Frame (b, endstage, idx) lives in ex_b/ex_end/ex_idx[top]
+        sb = self.ex_b
+        send = self.ex_end
+        sidx = self.ex_idx
+        sb[0] = b
+        send[0] = endstage
+        sidx[0] = 0
+        top = 0
+
+        while top >= 0:
+            fb = sb[top]
+            fend = send[top]
+            fidx = sidx[top]
             bl = self.blos[fb]
 
             if fidx < len(bl.childs):
                 s = bl.childs[fidx]
-                stack[-1] = (fb, fend, fidx + 1)
+                sidx[top] = fidx + 1
                 self.blossomparent[s] = NIL
-                if self.is_blossom(s):
+                if s >= self.n:
                     if fend:
-                        stack.append((s, True, 0))
+                        top += 1
+                        sb[top] = s
+                        send[top] = True
+                        sidx[top] = 0
                         continue
                     else:
                         for u in self.leaves(s):
@@ -230,20 +317,16 @@ class Solver:
                 if not fend and self.label[fb] == 2:
                     # Mid-stage T-blossom expansion: relabel children
                     bl2 = self.blos[fb]
-                    entrychild = self.inblossom[self.labeledge[fb][1]]
+                    entrychild = self.inblossom[self.le_dst[fb]]
                     k = len(bl2.childs)
-                    j = 0
-                    while j < k:
-                        if bl2.childs[j] == entrychild:
-                            break
-                        j += 1
+                    j = bl2.childs.index(entrychild)
                     if j & 1:
                         j -= k
                         jstep = 1
                     else:
                         jstep = -1
-                    lv_ = self.labeledge[fb][0]
-                    lw_ = self.labeledge[fb][1]
+                    lv_ = self.le_src[fb]
+                    lw_ = self.le_dst[fb]
                     while j != 0:
                         if jstep == 1:
                             pp = bl2.edges[j % k][0]
@@ -266,18 +349,17 @@ class Solver:
                         j += jstep
 
                     bwi = bl2.childs[j % k]
-                    self.ensure(bwi)
                     self.label[lw_] = self.label[bwi] = 2
-                    self.labeledge[lw_] = self.labeledge[bwi] = (lv_, lw_)
+                    self.le_src[lw_] = self.le_src[bwi] = lv_
+                    self.le_dst[lw_] = self.le_dst[bwi] = lw_
                     j += jstep
                     while bl2.childs[j % k] != entrychild:
                         bvi = bl2.childs[j % k]
-                        self.ensure(bvi)
                         if self.label[bvi] == 1:
                             j += jstep
                             continue
                         found_v = NIL
-                        if self.is_blossom(bvi):
+                        if bvi >= self.n:
                             for u in self.leaves(bvi):
                                 if self.label[u]:
                                     found_v = u
@@ -287,153 +369,157 @@ class Solver:
                         if found_v != NIL and self.label[found_v]:
                             self.label[found_v] = 0
                             self.label[self.mate[self.blossombase[bvi]]] = 0
-                            self.assign_label(found_v, 2, self.labeledge[found_v][0])
+                            self.assign_label(found_v, 2, self.le_src[found_v])
                         j += jstep
 
                 self.label[fb] = 0
                 bl.childs.clear()
                 bl.edges.clear()
-                stack.pop()
+                bl.leaves = None
+                top -= 1
 
     # ---- Augmentation through blossoms ----
 
     def augment_blossom(self, b, v):
         # Iterative version using explicit stack
-        # Frame: (b, v, phase, i, j, jstep)
-        stack = [(b, v, 0, 0, 0, 0)]
-
-        while stack:
-            f = stack[-1]
-            fb, fv, fphase, fi, fj, fjstep = f
+        # Frame (b, v, phase, i, j, jstep) lives in the au_* lists at [top];
+        # a phase change is a few item stores rather than a new tuple.
+        # Phases fall through: 0 -> 1 -> 2 -> 3 -> 4 -> back to 2, leaving
+        # the loop only to recurse into a sub-blossom or to pop the frame.
+        n = self.n
+        blos = self.blos
+        blossomparent = self.blossomparent
+        mate = self.mate
+        sb = self.au_b
+        sv = self.au_v
+        sp = self.au_phase
+        si = self.au_i
+        sj = self.au_j
+        sjs = self.au_jstep
+        sb[0] = b
+        sv[0] = v
+        sp[0] = 0
+        top = 0
+
+        while top >= 0:
+            fb = sb[top]
+            fphase = sp[top]
+            bl = blos[fb]
+            k = len(bl.childs)
 
             if fphase == 0:
                 # Find sub-blossom containing v
+                fv = sv[top]
                 t = fv
-                while self.blossomparent[t] != fb:
-                    t = self.blossomparent[t]
-                bl = self.blos[fb]
-                k = len(bl.childs)
-                i = 0
-                while i < k:
-                    if bl.childs[i] == t:
-                        break
-                    i += 1
-                if self.is_blossom(t):
-                    stack[-1] = (fb, fv, 1, i, 0, 0)
-                    stack.append((t, fv, 0, 0, 0, 0))
+                while blossomparent[t] != fb:
+                    t = blossomparent[t]
+                si[top] = bl.childs.index(t)
+                if t >= n:
+                    sp[top] = 1
+                    top += 1
+                    sb[top] = t
+                    sv[top] = fv
+                    sp[top] = 0
                     continue
-                if i & 1:
-                    j = i - k
-                    jstep = 1
-                else:
-                    j = i
-                    jstep = -1
-                stack[-1] = (fb, fv, 2, i, j, jstep)
-                continue
+                fphase = 1
 
             if fphase == 1:
-                # After recursion into sub-blossom
-                bl = self.blos[fb]
-                k = len(bl.childs)
+                # After (optional) recursion into the sub-blossom holding v
+                fi = si[top]
                 if fi & 1:
-                    j = fi - k
-                    jstep = 1
+                    sj[top] = fi - k
+                    sjs[top] = 1
                 else:
-                    j = fi
-                    jstep = -1
-                stack[-1] = (fb, fv, 2, fi, j, jstep)
-                continue
+                    sj[top] = fi
+                    sjs[top] = -1
+                fphase = 2
 
             if fphase == 2:
                 # Main loop: walk from position i toward position 0
-                bl = self.blos[fb]
-                k = len(bl.childs)
+                fj = sj[top]
                 if fj == 0:
                     # Done: rotate childs/edges so new base is first
+                    fi = si[top]
                     if fi > 0:
                         bl.childs = bl.childs[fi:] + bl.childs[:fi]
                         bl.edges = bl.edges[fi:] + bl.edges[:fi]
-                    self.blossombase[fb] = fv
-                    stack.pop()
+                    self.blossombase[fb] = sv[top]
+                    top -= 1
                     continue
                 # Step to next pair of sub-blossoms
+                fjstep = sjs[top]
                 fj += fjstep
+                sj[top] = fj
                 idx1 = fj % k
                 c1 = bl.childs[idx1]
                 if fjstep == 1:
                     ww = bl.edges[idx1][0]
-                    xx = bl.edges[idx1][1]
                 else:
-                    ei = (fj - 1) % k
-                    xx = bl.edges[ei][0]
-                    ww = bl.edges[ei][1]
-                if self.is_blossom(c1):
-                    stack[-1] = (fb, fv, 3, fi, fj, fjstep)
-                    stack.append((c1, ww, 0, 0, 0, 0))
+                    ww = bl.edges[(fj - 1) % k][1]
+                sp[top] = 3
+                if c1 >= n:
+                    top += 1
+                    sb[top] = c1
+                    sv[top] = ww
+                    sp[top] = 0
                     continue
-                stack[-1] = (fb, fv, 3, fi, fj, fjstep)
+                fphase = 3
 
             if fphase == 3:
                 # After optional recursion for c1, step to c2
-                bl = self.blos[fb]
-                k = len(bl.childs)
-                idx1 = fj % k
+                fj = sj[top]
+                fjstep = sjs[top]
                 if fjstep == 1:
-                    ww = bl.edges[idx1][0]
-                    xx = bl.edges[idx1][1]
+                    xx = bl.edges[fj % k][1]
                 else:
-                    ei = (fj - 1) % k
-                    xx = bl.edges[ei][0]
-                    ww = bl.edges[ei][1]
+                    xx = bl.edges[(fj - 1) % k][0]
                 fj += fjstep
-                idx2 = fj % k
-                c2 = bl.childs[idx2]
-                if self.is_blossom(c2):
-                    stack[-1] = (fb, fv, 4, fi, fj, fjstep)
-                    stack.append((c2, xx, 0, 0, 0, 0))
+                sj[top] = fj
+                c2 = bl.childs[fj % k]
+                sp[top] = 4
+                if c2 >= n:
+                    top += 1
+                    sb[top] = c2
+                    sv[top] = xx
+                    sp[top] = 0
                     continue
-                stack[-1] = (fb, fv, 4, fi, fj, fjstep)
-
-            if fphase == 4:
-                # After optional recursion for c2, set mate pair
-                bl = self.blos[fb]
-                k = len(bl.childs)
-                prev_j = fj - fjstep
-                idx1 = prev_j % k
-                if fjstep == 1:
-                    ww = bl.edges[idx1][0]
-                    xx = bl.edges[idx1][1]
-                else:
-                    ei = (prev_j - 1) % k
-                    xx = bl.edges[ei][0]
-                    ww = bl.edges[ei][1]
-                self.mate[ww] = xx
-                self.mate[xx] = ww
-                stack[-1] = (fb, fv, 2, fi, fj, fjstep)  # continue loop
+
+            # Phase 4: after optional recursion for c2, set mate pair
+            fjstep = sjs[top]
+            prev_j = sj[top] - fjstep
+            if fjstep == 1:
+                ww, xx = bl.edges[prev_j % k]
+            else:
+                xx, ww = bl.edges[(prev_j - 1) % k]
+            mate[ww] = xx
+            mate[xx] = ww
+            sp[top] = 2  # continue loop
 
     # ---- Augmenting path: trace both sides back to their roots ----
 
+    def augment_path(self, s, j):
+        """Match S-vertex s to j, then flip the alternating path from s
+        back to its root in place, lifting through blossoms as we go."""
+        while True:
+            bs = self.inblossom[s]
+            if bs >= self.n:
+                self.augment_blossom(bs, s)
+            self.mate[s] = j
+            t = self.le_src[bs]  # T-vertex
+            if t == NIL:
+                break  # root
+            bt = self.inblossom[t]
+            s = self.le_src[bt]
+            j = self.le_dst[bt]
+            if bt >= self.n:
+                self.augment_blossom(bt, j)
+            self.mate[j] = s
+
     def augment_matching(self, v, w):
         """v and w are S-vertices in different trees. Edge (v,w) completes
         an augmenting path. Trace from each side back to its root."""
-        for s_start, j_start in [(v, w), (w, v)]:
-            s, j = s_start, j_start
-            while True:
-                bs = self.inblossom[s]
-                if self.is_blossom(bs):
-                    self.augment_blossom(bs, s)
-                self.mate[s] = j
-                le = self.labeledge[bs]
-                if le[0] == NIL:
-                    break  # root
-                t = le[0]  # T-vertex
-                bt = self.inblossom[t]
-                le2 = self.labeledge[bt]
-                s = le2[0]
-                j = le2[1]
-                if self.is_blossom(bt):
-                    self.augment_blossom(bt, j)
-                self.mate[j] = s
+        self.augment_path(v, w)
+        self.augment_path(w, v)
 
     # ---- Greedy initialization ----
 
@@ -442,7 +528,7 @@ class Solver:
         for u in range(self.n):
             if self.mate[u] != NIL:
                 continue
-            for v in self.adj[u]:
+            for v in self.edges[self.adj_start[u]:self.adj_start[u + 1]]:
                 if self.mate[v] == NIL:
                     self.mate[u] = v
                     self.mate[v] = u
@@ -455,20 +541,29 @@ class Solver:
         n = self.n
         deg = [0] * n
         for u in range(n):
-            deg[u] = len(self.adj[u])
-        order = sorted(range(n), key=lambda x: (deg[x], x))
+            deg[u] = self.adj_start[u + 1] - self.adj_start[u]
+        # Stable sort on degree alone gives the (degree, id) order with no
+        # per-vertex key tuples or Python-level key calls
+        order = sorted(range(n), key=deg.__getitem__)
+        mate = self.mate
+        edges = self.edges
+        adj_start = self.adj_start
         for u in order:
-            if self.mate[u] != NIL:
+            if mate[u] != NIL:
                 continue
             best = NIL
-            bd = float('inf')
-            for v in self.adj[u]:
-                if self.mate[v] == NIL and deg[v] < bd:
-                    best = v
-                    bd = deg[v]
+            bd = n  # int sentinel: every degree is below n
+            for v in edges[adj_start[u]:adj_start[u + 1]]:
+                if mate[v] == NIL:
+                    d = deg[v]
+                    if d < bd:
+                        best = v
+                        bd = d
+                        if d == 1:
+                            break  # a pendant neighbor cannot be beaten
             if best >= 0:
-                self.mate[u] = best
-                self.mate[best] = u
+                mate[u] = best
+                mate[best] = u
                 cnt += 1
         return cnt
 
@@ -489,57 +584,94 @@ class Solver:
                 if self.mate[v] == NIL and self.label[self.inblossom[v]] == 0:
                     self.assign_label(v, 1, NIL)
 
-            # BFS: grow forest until augmenting path or exhaustion
+            # BFS: grow forest until exhaustion, augmenting between live trees
             augmented = False
-            while self.queue and not augmented:
-                v = self.queue.pop()
-                if self.label[self.inblossom[v]] != 1:
+            n = self.n
+            tree_root = self.tree_root
+            dead = self.dead
+            label = self.label
+            le_src = self.le_src
+            le_dst = self.le_dst
+            inblossom = self.inblossom
+            mate = self.mate
+            # FIFO scan: queue is append-only within a stage; qi is the head.
+            queue = self.queue
+            qi = 0
+            while qi < len(queue):
+                v = queue[qi]
+                qi += 1
+                bv = inblossom[v]
+                if label[bv] != 1:
                     continue  # stale
-                for w in self.adj[v]:
-                    bv = self.inblossom[v]
-                    bw = self.inblossom[w]
+                if dead[tree_root[v]]:
+                    continue  # tree already augmented this stage
+                # The matched edge leads to v's tree parent or stays inside
+                # v's blossom, so it never yields a step: skip it up front.
+                mv = mate[v]
+                for w in self.edges[self.adj_start[v]:self.adj_start[v + 1]]:
+                    if w == mv:
+                        continue
+                    bw = inblossom[w]
                     if bv == bw:
                         continue
-                    self.ensure(bw)
-                    if self.label[bw] == 0:
-                        # w is unlabeled: grow the tree
-                        self.assign_label(w, 2, v)
-                    elif self.label[bw] == 1:
+                    lw = label[bw]
+                    if lw == 0:
+                        # w is unlabeled: grow the tree. Blossoms only ever
+                        # hold labeled vertices, so w and its mate are almost
+                        # always trivial; label both inline in that case.
+                        x = mate[w]
+                        if bw < n and inblossom[x] == x:
+                            label[w] = 2
+                            le_src[w] = v
+                            le_dst[w] = w
+                            label[x] = 1
+                            le_src[x] = w
+                            le_dst[x] = x
+                            tree_root[w] = tree_root[x] = tree_root[v]
+                            queue.append(x)
+                        else:
+                            self.assign_label(w, 2, v)
+                    elif lw == 1:
                         # S-S edge: blossom or augmenting path
+                        if dead[tree_root[w]]:
+                            continue
                         base = self.scan_blossom(v, w)
                         if base >= 0:
                             self.add_blossom(base, v, w)
+                            bv = inblossom[v]  # v now lives in the new blossom
                         else:
                             # base == -2: two different trees met -> augmenting path
+                            rv = tree_root[v]
+                            rw = tree_root[w]
                             self.augment_matching(v, w)
+                            dead[rv] = dead[rw] = 1
                             augmented = True
                             break
                     # label[bw]==2: T-blossom edge, ignore
 
             # Expand all remaining blossoms (end of stage)
-            for b in range(self.n, self.nblos):
-                if (b < len(self.blos) and self.blos[b] is not None
-                        and self.blos[b].childs and self.blossomparent[b] == NIL):
-                    self.expand_blossom(b, True)
+            for b in self.top_blossoms:
+                self.expand_blossom(b, True)
+            self.top_blossoms.clear()
 
             if not augmented:
                 break  # no augmenting path found: matching is maximum
 
-        result = []
-        for u in range(self.n):
-            if self.mate[u] > u:
-                result.append((u, self.mate[u]))
-        result.sort()
-        return result
+        # enumerate() walks u in ascending order, so the pairs come out
+        # sorted; NIL mates (-1) never pass v > u
+        return [(u, v) for u, v in enumerate(self.mate) if v > u]
 
 
 # ---- Validation ----
 
-def validate_matching(n, graph, matching):
+def validate_matching(n, edges_flat, adj_start, matching):
     deg = [0] * n
     errors = 0
     for u, v in matching:
-        if v not in graph[u]:
+        # Each adjacency run is sorted: binary search instead of a scan
+        lo, hi = adj_start[u], adj_start[u + 1]
+        i = bisect_left(edges_flat, v, lo, hi)
+        if i == hi or edges_flat[i] != v:
             print(f"ERROR: Edge ({u},{v}) not in graph!", file=sys.stderr)
             errors += 1
         deg[u] += 1
@@ -597,7 +729,7 @@ def main():
     matching = sol.solve(greedy_mode)
     t1 = time.time()
 
-    validate_matching(n, sol.adj, matching)
+    validate_matching(n, sol.edges, sol.adj_start, matching)
 
     print(f"Matching size: {len(matching)}")
     if greedy_mode > 0:
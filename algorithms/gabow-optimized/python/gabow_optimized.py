@@ -14,6 +14,7 @@ dual machinery. All integers, fully deterministic.
 
 import sys
 import time
+from array import array
 from bisect import insort, bisect_left
 
 NIL = -1
@@ -25,48 +26,92 @@ ODD = 2
 class GabowOptimized:
     def __init__(self, n, edges):
         self.n = n
-        self.graph = [[] for _ in range(n)]
+        adj = [[] for _ in range(n)]
         for u, v in edges:
             if 0 <= u < n and 0 <= v < n and u != v:
-                self.graph[u].append(v)
-                self.graph[v].append(u)
+                adj[u].append(v)
+                adj[v].append(u)
+
+        # CSR adjacency: neighbors of v are edges[adj_start[v]:adj_start[v + 1]]
+        self.adj_start = array('i', [0]) * (n + 1)
+        self.edges = array('i')
         for i in range(n):
-            self.graph[i] = sorted(set(self.graph[i]))
-
-        self.mate = [NIL] * n
-        self.label = [UNLABELED] * n
-        self.parent = [NIL] * n
-        self.source_bridge = [NIL] * n
-        self.target_bridge = [NIL] * n
-        self.base_par = list(range(n))
-        self.dbase_par = list(range(n))
-        self.level_queue = [[] for _ in range(n + 2)]
-        self.lca_tag1 = [0] * n
-        self.lca_tag2 = [0] * n
+            self.edges.extend(sorted(set(adj[i])))
+            self.adj_start[i + 1] = len(self.edges)
+
+        # Vertex-indexed int state lives in array('i') buffers: 4 bytes per
+        # entry instead of an 8-byte list slot plus a boxed int for every
+        # value above 256. The lca tags hold epochs that grow over the
+        # whole run, so they get 64-bit 'q' slots; dir_h (-1/0) fits 'b'.
+        self.mate = array('i', [NIL]) * n
+        # Labels (0/1/2) and in_tree flags fit in a byte: bytearrays keep
+        # these per-vertex arrays at 1 byte per entry instead of 8.
+        self.label = bytearray(n)
+        self.parent = array('i', [NIL]) * n
+        self.source_bridge = array('i', [NIL]) * n
+        self.target_bridge = array('i', [NIL]) * n
+        self.base_par = array('i', range(n))
+        self.dbase_par = array('i', range(n))
+        # Union-by-rank for the dbase/db2 forests (ranks stay below log2 n,
+        # so a byte each). base_par has no rank: union_base forces its root.
+        self.dbase_rank = bytearray(n)
+        # Edge queues for level delta (cur_*) and delta + 1 (nxt_*), one
+        # list per endpoint so no (u, v) tuple is built per edge. Edges
+        # only ever go to those two levels, so the pair swaps as delta
+        # advances instead of keeping n + 2 per-level lists.
+        self.cur_src = []
+        self.cur_dst = []
+        self.nxt_src = []
+        self.nxt_dst = []
+        self.lca_tag1 = array('q', [0]) * n
+        self.lca_tag2 = array('q', [0]) * n
         self.lca_epoch = 0
-        self.in_tree = [False] * n
+        self.in_tree = bytearray(n)
         self.tree_nodes = []
         self.delta = 0
 
-        self.rep = [0] * n
-        self.mate_h = [NIL] * n
-        self.label_h = [UNLABELED] * n
-        self.parent_h_src = [NIL] * n
-        self.parent_h_tgt = [NIL] * n
-        self.bridge_h_src = [NIL] * n
-        self.bridge_h_tgt = [NIL] * n
-        self.dir_h = [0] * n
-        self.even_time_h = [0] * n
+        self.rep = array('i', [0]) * n
+        self.mate_h = array('i', [NIL]) * n
+        self.label_h = bytearray(n)
+        self.parent_h_src = array('i', [NIL]) * n
+        self.parent_h_tgt = array('i', [NIL]) * n
+        self.bridge_h_src = array('i', [NIL]) * n
+        self.bridge_h_tgt = array('i', [NIL]) * n
+        self.dir_h = array('b', [0]) * n
+        self.even_time_h = array('i', [0]) * n
         self.t_h = 0
-        self.db2_par = list(range(n))
+        self.db2_par = array('i', range(n))
+        self.db2_rank = bytearray(n)
         self.contracted_into = [[] for _ in range(n)]
 
+        # Phase-2 DFS stacks, one array per frame field, indexed by a top
+        # counter (no per-frame list). Each frame is tied to a distinct
+        # vertex, so n + 1 slots always suffice.
+        self.ap_vh = array('i', [0]) * (n + 1)
+        self.ap_ci = array('i', [0]) * (n + 1)
+        self.ap_adj = array('i', [0]) * (n + 1)
+        self.tr_u = array('i', [0]) * (n + 1)
+        self.tr_bs = array('i', [0]) * (n + 1)
+        self.tr_bt = array('i', [0]) * (n + 1)
+        self.tr_nb = array('i', [0]) * (n + 1)
+        self.pg_u = array('i', [0]) * (n + 1)
+        self.pg_sb = array('i', [0]) * (n + 1)
+        self.pg_tb = array('i', [0]) * (n + 1)
+
     # ---- union-find: base ----
     def find_base(self, v):
-        while self.base_par[v] != v:
-            self.base_par[v] = self.base_par[self.base_par[v]]
-            v = self.base_par[v]
-        return v
+        # Two passes: find the root, then point every vertex on the path at it
+        par = self.base_par
+        r = par[v]
+        if par[r] == r:
+            return r  # v is a root or one hop below one: nothing to compress
+        while par[r] != r:
+            r = par[r]
+        while v != r:
+            nxt = par[v]
+            par[v] = r
+            v = nxt
+        return r
 
     def union_base(self, a, b, r):
         a = self.find_base(a)
@@ -76,155 +121,235 @@ class GabowOptimized:
 
     # ---- union-find: dbase ----
     def find_dbase(self, v):
-        while self.dbase_par[v] != v:
-            self.dbase_par[v] = self.dbase_par[self.dbase_par[v]]
-            v = self.dbase_par[v]
-        return v
+        par = self.dbase_par
+        r = par[v]
+        if r == v:
+            return v
+        while par[r] != r:
+            r = par[r]
+        while v != r:
+            nxt = par[v]
+            par[v] = r
+            v = nxt
+        return r
 
     def union_dbase(self, a, b):
         a = self.find_dbase(a)
         b = self.find_dbase(b)
         if a != b:
-            self.dbase_par[a] = b
+            rank = self.dbase_rank
+            ra = rank[a]
+            rb = rank[b]
+            if ra < rb:
+                self.dbase_par[a] = b
+            elif ra > rb:
+                self.dbase_par[b] = a
+            else:
+                self.dbase_par[a] = b
+                rank[b] = rb + 1
 
     def make_rep_dbase(self, v):
+        # v takes over as root (and its rank): the representative is fixed
+        # by the caller, whatever root union by rank picked
         r = self.find_dbase(v)
         if r != v:
             self.dbase_par[r] = v
             self.dbase_par[v] = v
+            self.dbase_rank[v] = self.dbase_rank[r]
 
     # ---- union-find: dbase2 ----
     def find_db2(self, v):
-        while self.db2_par[v] != v:
-            self.db2_par[v] = self.db2_par[self.db2_par[v]]
-            v = self.db2_par[v]
-        return v
+        par = self.db2_par
+        r = par[v]
+        if r == v:
+            return v
+        while par[r] != r:
+            r = par[r]
+        while v != r:
+            nxt = par[v]
+            par[v] = r
+            v = nxt
+        return r
 
     def union_db2(self, a, b):
         a = self.find_db2(a)
         b = self.find_db2(b)
         if a != b:
-            self.db2_par[a] = b
+            rank = self.db2_rank
+            ra = rank[a]
+            rb = rank[b]
+            if ra < rb:
+                self.db2_par[a] = b
+            elif ra > rb:
+                self.db2_par[b] = a
+            else:
+                self.db2_par[a] = b
+                rank[b] = rb + 1
 
     def make_rep_db2(self, v):
         r = self.find_db2(v)
         if r != v:
             self.db2_par[r] = v
             self.db2_par[v] = v
+            self.db2_rank[v] = self.db2_rank[r]
 
     # ---- interleaved LCA ----
     def find_lca(self, u, v):
+        # Marks are epoch stamps (tag == ep), so no per-call clearing; the
+        # 64-bit tags cannot wrap in any run, so the epoch is never reset.
         self.lca_epoch += 1
         ep = self.lca_epoch
-        hx = self.find_base(u)
-        hy = self.find_base(v)
-        self.lca_tag1[hx] = ep
-        self.lca_tag2[hy] = ep
+        tag1 = self.lca_tag1
+        tag2 = self.lca_tag2
+        mate = self.mate
+        parent = self.parent
+        find_base = self.find_base
+        hx = find_base(u)
+        hy = find_base(v)
+        tag1[hx] = ep
+        tag2[hy] = ep
         while True:
-            if self.lca_tag1[hy] == ep: return hy
-            if self.lca_tag2[hx] == ep: return hx
-            hxr = (self.mate[hx] == NIL or self.parent[self.mate[hx]] == NIL)
-            hyr = (self.mate[hy] == NIL or self.parent[self.mate[hy]] == NIL)
-            if hxr and hyr: return NIL
-            if not hxr:
-                hx = self.find_base(self.parent[self.mate[hx]])
-                self.lca_tag1[hx] = ep
-            if not hyr:
-                hy = self.find_base(self.parent[self.mate[hy]])
-                self.lca_tag2[hy] = ep
+            if tag1[hy] == ep: return hy
+            if tag2[hx] == ep: return hx
+            mx = mate[hx]
+            my = mate[hy]
+            px = NIL if mx == NIL else parent[mx]
+            py = NIL if my == NIL else parent[my]
+            if px == NIL and py == NIL: return NIL
+            if px != NIL:
+                hx = find_base(px)
+                tag1[hx] = ep
+            if py != NIL:
+                hy = find_base(py)
+                tag2[hy] = ep
 
     # ---- shrink_path ----
     def shrink_path(self, b, x, y, dunions):
-        v = self.find_base(x)
+        find_base = self.find_base
+        union_base = self.union_base
+        mate = self.mate
+        label = self.label
+        edges = self.edges
+        adj_start = self.adj_start
+        base_par = self.base_par
+        cur_src = self.cur_src
+        cur_dst = self.cur_dst
+        nxt_src = self.nxt_src
+        nxt_dst = self.nxt_dst
+        v = find_base(x)
         while v != b:
-            self.union_base(v, b, b)
+            union_base(v, b, b)
             dunions.append((v, b))
-            mv = self.mate[v]
-            self.union_base(mv, b, b)
+            mv = mate[v]
+            union_base(mv, b, b)
             dunions.append((mv, b))
-            self.base_par[b] = b
+            base_par[b] = b
             self.source_bridge[mv] = x
             self.target_bridge[mv] = y
-            d = self.delta
-            for w in self.graph[mv]:
-                if w == self.mate[mv]: continue
-                bw = self.find_base(w)
-                if self.label[bw] == ODD: continue
-                if self.label[bw] == UNLABELED:
-                    self.level_queue[d + 1].append((mv, w))
-                elif self.label[bw] == EVEN:
-                    self.level_queue[d].append((mv, w))
-            v = self.find_base(self.parent[mv])
+            mmv = mate[mv]
+            for w in edges[adj_start[mv]:adj_start[mv + 1]]:
+                if w == mmv: continue
+                lw = label[find_base(w)]
+                if lw == UNLABELED:
+                    nxt_src.append(mv)
+                    nxt_dst.append(w)
+                elif lw == EVEN:
+                    cur_src.append(mv)
+                    cur_dst.append(w)
+            v = find_base(self.parent[mv])
         dunions.append((b, b))
 
     # ================================================================
     #                          PHASE 1
     # ================================================================
     def phase_1(self):
+        n = self.n
         self.delta = 0
         self.tree_nodes = []
-        for q in self.level_queue:
-            q.clear()
+        cur_src = self.cur_src
+        cur_dst = self.cur_dst
+        nxt_src = self.nxt_src
+        nxt_dst = self.nxt_dst
+        cur_src.clear()
+        cur_dst.clear()
+        nxt_src.clear()
+        nxt_dst.clear()
         dunions = []
-
-        for i in range(self.n):
-            self.base_par[i] = i
-            self.dbase_par[i] = i
-            self.label[i] = UNLABELED
-            self.parent[i] = NIL
-            self.source_bridge[i] = NIL
-            self.target_bridge[i] = NIL
-            self.in_tree[i] = False
-
-        for v in range(self.n):
-            if self.mate[v] == NIL:
-                self.label[v] = EVEN
-                self.in_tree[v] = True
-                self.tree_nodes.append(v)
-                for u in self.graph[v]:
-                    if u == self.mate[v]: continue
-                    bu = self.find_base(u)
-                    if self.label[bu] == ODD: continue
-                    if self.label[bu] == UNLABELED:
-                        self.level_queue[1].append((v, u))
-                    elif self.label[bu] == EVEN:
-                        self.level_queue[0].append((v, u))
+        find_base = self.find_base
+        mate = self.mate
+        label = self.label
+        parent = self.parent
+        in_tree = self.in_tree
+        tree_nodes = self.tree_nodes
+        edges = self.edges
+        adj_start = self.adj_start
+        base_par = self.base_par
+
+        # Per-phase reset as bulk slice stores: the arrays are reused in
+        # place and filled in C rather than by an n-step Python loop
+        base_par[:] = array('i', range(n))
+        self.dbase_par[:] = array('i', range(n))
+        self.dbase_rank[:] = bytes(n)
+        label[:] = bytes(n)  # UNLABELED == 0
+        in_tree[:] = bytes(n)
+        nil_row = array('i', [NIL]) * n
+        parent[:] = nil_row
+        self.source_bridge[:] = nil_row
+        self.target_bridge[:] = nil_row
+
+        for v in range(n):
+            if mate[v] == NIL:
+                label[v] = EVEN
+                in_tree[v] = True
+                tree_nodes.append(v)
+                for u in edges[adj_start[v]:adj_start[v + 1]]:
+                    lu = label[u]  # no blossoms yet: every base is itself
+                    if lu == UNLABELED:
+                        nxt_src.append(v)
+                        nxt_dst.append(u)
+                    elif lu == EVEN:
+                        cur_src.append(v)
+                        cur_dst.append(u)
 
         found_sap = False
 
-        while self.delta <= self.n:
-            d = self.delta
-            while self.level_queue[d]:
-                z, u = self.level_queue[d].pop()
-                bz = self.find_base(z)
-                bu = self.find_base(u)
-                if self.label[bz] != EVEN:
+        while self.delta <= n:
+            while cur_src:
+                z = cur_src.pop()
+                u = cur_dst.pop()
+                # Most vertices are their own base: test that inline and
+                # only call find_base for vertices inside a blossom
+                bz = z if base_par[z] == z else find_base(z)
+                bu = u if base_par[u] == u else find_base(u)
+                if label[bz] != EVEN:
                     z, u = u, z
                     bz, bu = bu, bz
-                if bz == bu or self.label[bz] != EVEN: continue
-                if u == self.mate[z] or self.label[bu] == ODD: continue
+                if bz == bu or label[bz] != EVEN: continue
+                lu = label[bu]
+                if u == mate[z] or lu == ODD: continue
 
-                if self.label[bu] == UNLABELED:
-                    mv = self.mate[u]
+                if lu == UNLABELED:
+                    mv = mate[u]
                     if mv == NIL: continue
-                    self.parent[u] = z
-                    self.parent[mv] = u
-                    self.label[u] = ODD
-                    self.label[mv] = EVEN
-                    self.in_tree[u] = True
-                    self.in_tree[mv] = True
-                    self.tree_nodes.append(u)
-                    self.tree_nodes.append(mv)
-                    for w in self.graph[mv]:
-                        if w == self.mate[mv]: continue
-                        bw = self.find_base(w)
-                        if self.label[bw] == ODD: continue
-                        if self.label[bw] == UNLABELED:
-                            self.level_queue[d + 1].append((mv, w))
-                        elif self.label[bw] == EVEN:
-                            self.level_queue[d].append((mv, w))
-
-                elif self.label[bu] == EVEN:
+                    parent[u] = z
+                    parent[mv] = u
+                    label[u] = ODD
+                    label[mv] = EVEN
+                    in_tree[u] = True
+                    in_tree[mv] = True
+                    tree_nodes.append(u)
+                    tree_nodes.append(mv)
+                    for w in edges[adj_start[mv]:adj_start[mv + 1]]:
+                        if w == u: continue  # u is mv's mate
+                        lw = label[w if base_par[w] == w else find_base(w)]
+                        if lw == UNLABELED:
+                            nxt_src.append(mv)
+                            nxt_dst.append(w)
+                        elif lw == EVEN:
+                            cur_src.append(mv)
+                            cur_dst.append(w)
+
+                else:  # lu == EVEN
                     lca = self.find_lca(z, u)
                     if lca != NIL:
                         self.shrink_path(lca, z, u, dunions)
@@ -254,7 +379,17 @@ class GabowOptimized:
                 else:
                     self.union_dbase(a, b)
             dunions.clear()
+            if not nxt_src:
+                break  # both levels empty: no edge can be queued again
             self.delta += 1
+            # Level delta is drained: the next level becomes current and
+            # the emptied lists take its place
+            cur_src, nxt_src = nxt_src, cur_src
+            cur_dst, nxt_dst = nxt_dst, cur_dst
+            self.cur_src = cur_src
+            self.cur_dst = cur_dst
+            self.nxt_src = nxt_src
+            self.nxt_dst = nxt_dst
 
         return False
 
@@ -264,62 +399,89 @@ class GabowOptimized:
 
     def find_ap_hg(self, root_vh):
         """Iterative DFS in H using contracted_into + graph scan."""
-        # Stack: (vh, ci_idx, adj_idx)
-        stk = [[root_vh, 0, 0]]
-
-        while stk:
-            f = stk[-1]
-            vh = f[0]
-            ci = self.contracted_into[vh]
+        # Frame (vh, ci_idx, adj_idx) lives in ap_vh/ap_ci/ap_adj[top]; the
+        # current frame's indices are kept in locals and stored back only
+        # when a child is pushed. adj_idx is relative to adj_start[v].
+        edges = self.edges
+        adj_start = self.adj_start
+        contracted_into = self.contracted_into
+        in_tree = self.in_tree
+        mate = self.mate
+        find_dbase = self.find_dbase
+        find_db2 = self.find_db2
+        rep = self.rep
+        mate_h = self.mate_h
+        label_h = self.label_h
+        parent_h_src = self.parent_h_src
+        parent_h_tgt = self.parent_h_tgt
+        sv = self.ap_vh
+        si = self.ap_ci
+        sj = self.ap_adj
+        top = 0
+        sv[0] = root_vh
+        si[0] = 0
+        sj[0] = 0
+
+        while top >= 0:
+            vh = sv[top]
+            i = si[top]
+            j = sj[top]
+            ci = contracted_into[vh]
 
             found_next = False
-            while f[1] < len(ci):
-                v = ci[f[1]]
-                gv = self.graph[v]
-                while f[2] < len(gv):
-                    w = gv[f[2]]
-                    f[2] += 1
-
-                    if not self.in_tree[w]: continue
-                    if self.mate[v] == w: continue
-                    if self.find_dbase(w) == self.find_dbase(v): continue
-                    uh = self.find_db2(self.rep[w])
-                    if self.mate_h[vh] == uh: continue
-                    if self.label_h[uh] == ODD: continue
-
-                    if self.label_h[uh] == UNLABELED:
-                        muh = self.mate_h[uh]
+            while i < len(ci):
+                v = ci[i]
+                lo = adj_start[v]
+                dv = adj_start[v + 1] - lo
+                while j < dv:
+                    w = edges[lo + j]
+                    j += 1
+
+                    if not in_tree[w]: continue
+                    if mate[v] == w: continue
+                    if find_dbase(w) == find_dbase(v): continue
+                    uh = find_db2(rep[w])
+                    if mate_h[vh] == uh: continue
+                    if label_h[uh] == ODD: continue
+
+                    if label_h[uh] == UNLABELED:
+                        muh = mate_h[uh]
                         if muh == NIL:
-                            self.label_h[uh] = ODD
-                            self.parent_h_src[uh] = w
-                            self.parent_h_tgt[uh] = v
+                            label_h[uh] = ODD
+                            parent_h_src[uh] = w
+                            parent_h_tgt[uh] = v
                             return uh
-                        self.label_h[uh] = ODD
-                        self.parent_h_src[uh] = w
-                        self.parent_h_tgt[uh] = v
-                        self.label_h[muh] = EVEN
+                        label_h[uh] = ODD
+                        parent_h_src[uh] = w
+                        parent_h_tgt[uh] = v
+                        label_h[muh] = EVEN
                         self.even_time_h[muh] = self.t_h
                         self.t_h += 1
-                        stk.append([muh, 0, 0])
+                        si[top] = i
+                        sj[top] = j
+                        top += 1
+                        sv[top] = muh
+                        si[top] = 0
+                        sj[top] = 0
                         found_next = True
                         break
 
-                    elif self.label_h[uh] == EVEN:
-                        bh = self.find_db2(vh)
-                        zh = self.find_db2(uh)
+                    elif label_h[uh] == EVEN:
+                        bh = find_db2(vh)
+                        zh = find_db2(uh)
                         if self.even_time_h[bh] < self.even_time_h[zh]:
                             tmp = []
                             endpoints = []
                             cur = zh
                             while cur != bh:
                                 endpoints.append(cur)
-                                mc = self.mate_h[cur]
+                                mc = mate_h[cur]
                                 endpoints.append(mc)
                                 tmp.append(mc)
-                                ps = self.parent_h_src[mc]
-                                pt = self.parent_h_tgt[mc]
-                                nxt = self.rep[pt] if self.rep[ps] == mc else self.rep[ps]
-                                cur = self.find_db2(nxt)
+                                ps = parent_h_src[mc]
+                                pt = parent_h_tgt[mc]
+                                nxt = rep[pt] if rep[ps] == mc else rep[ps]
+                                cur = find_db2(nxt)
                             for nd in endpoints:
                                 self.union_db2(nd, bh)
                             self.make_rep_db2(bh)
@@ -327,86 +489,118 @@ class GabowOptimized:
                                 self.bridge_h_src[mc] = v
                                 self.bridge_h_tgt[mc] = w
                                 self.dir_h[mc] = -1
-                            for i in range(len(tmp) - 1, -1, -1):
-                                stk.append([tmp[i], 0, 0])
+                            si[top] = i
+                            sj[top] = j
+                            for k in range(len(tmp) - 1, -1, -1):
+                                top += 1
+                                sv[top] = tmp[k]
+                                si[top] = 0
+                                sj[top] = 0
                             found_next = True
                             break
 
                 if found_next:
                     break
-                f[1] += 1
-                f[2] = 0
+                i += 1
+                j = 0
 
             if not found_next:
-                stk.pop()
+                top -= 1
 
         return NIL
 
     def trace_h_path(self, vh, uh, edges_out):
         """Iterative trace from vh to uh in H, collecting non-matching G-edges."""
-        # Stack: [vh, uh, phase, bs, bt, side_a, side_b]
-        stk = [[vh, uh, 0, 0, 0, 0, 0]]
-        while stk:
-            f = stk[-1]
-            if f[0] == f[1]:
-                stk.pop()
+        # Each ODD H-node x on the way splits into trace(side_a, mate(x))
+        # then trace(side_b, uh). The first runs now; the second is saved
+        # as (uh, bs, bt, side_b) in tr_u/tr_bs/tr_bt/tr_nb[top] and resumed,
+        # after emitting the bridge (bs, bt), once the first reaches its end.
+        label_h = self.label_h
+        mate_h = self.mate_h
+        parent_h_src = self.parent_h_src
+        parent_h_tgt = self.parent_h_tgt
+        bridge_h_src = self.bridge_h_src
+        bridge_h_tgt = self.bridge_h_tgt
+        dir_h = self.dir_h
+        rep = self.rep
+        su = self.tr_u
+        sbs = self.tr_bs
+        sbt = self.tr_bt
+        snb = self.tr_nb
+        top = -1
+        x = vh
+        y = uh
+        while True:
+            if x == y:
+                if top < 0:
+                    return
+                edges_out.append((sbs[top], sbt[top]))
+                x = snb[top]
+                y = su[top]
+                top -= 1
                 continue
-            if self.label_h[f[0]] == EVEN:
-                mvh = self.mate_h[f[0]]
-                ps = self.parent_h_src[mvh]
-                pt = self.parent_h_tgt[mvh]
+            if label_h[x] == EVEN:
+                mvh = mate_h[x]
+                ps = parent_h_src[mvh]
+                pt = parent_h_tgt[mvh]
                 edges_out.append((ps, pt))
-                f[0] = self.rep[pt] if self.rep[ps] == mvh else self.rep[ps]
-                continue
-            if f[2] == 0:
-                bs = self.bridge_h_src[f[0]]
-                bt = self.bridge_h_tgt[f[0]]
-                f[3] = bs
-                f[4] = bt
-                if self.dir_h[f[0]] == 1:
-                    f[5] = self.rep[bs]
-                    f[6] = self.rep[bt]
-                else:
-                    f[5] = self.rep[bt]
-                    f[6] = self.rep[bs]
-                f[2] = 1
-                mt = self.rep[self.mate_h[f[0]]] if self.mate_h[f[0]] != NIL else f[0]
-                stk.append([f[5], mt, 0, 0, 0, 0, 0])
+                x = rep[pt] if rep[ps] == mvh else rep[ps]
                 continue
-            if f[2] == 1:
-                edges_out.append((f[3], f[4]))
-                f[2] = 2
-                stk.append([f[6], f[1], 0, 0, 0, 0, 0])
-                continue
-            stk.pop()
+            bs = bridge_h_src[x]
+            bt = bridge_h_tgt[x]
+            if dir_h[x] == 1:
+                side_a = rep[bs]
+                side_b = rep[bt]
+            else:
+                side_a = rep[bt]
+                side_b = rep[bs]
+            top += 1
+            su[top] = y
+            sbs[top] = bs
+            sbt[top] = bt
+            snb[top] = side_b
+            y = rep[mate_h[x]] if mate_h[x] != NIL else x
+            x = side_a
 
     def find_path_in_g(self, v, u, pairs):
         """Iterative unfold within single H-node."""
-        # Stack: [v, u, phase, sb, tb]
-        stk = [[v, u, 0, 0, 0]]
-        while stk:
-            f = stk[-1]
-            if f[0] == f[1]:
-                stk.pop()
-                continue
-            if f[2] == 0:
-                if self.label[f[0]] == EVEN:
-                    mv = self.mate[f[0]]
-                    pmv = self.parent[mv]
-                    pairs.append((mv, pmv))
-                    f[0] = pmv
-                    continue
-                f[3] = self.source_bridge[f[0]]
-                f[4] = self.target_bridge[f[0]]
-                f[2] = 1
-                stk.append([f[3], self.mate[f[0]], 0, 0, 0])
+        # Same scheme as trace_h_path: an ODD x unfolds to path(sb, mate(x))
+        # then path(tb, u); the second half is saved as (u, sb, tb) in
+        # pg_u/pg_sb/pg_tb[top].
+        label = self.label
+        mate = self.mate
+        parent = self.parent
+        source_bridge = self.source_bridge
+        target_bridge = self.target_bridge
+        su = self.pg_u
+        ssb = self.pg_sb
+        stb = self.pg_tb
+        top = -1
+        x = v
+        y = u
+        while True:
+            if x == y:
+                if top < 0:
+                    return
+                tb = stb[top]
+                pairs.append((ssb[top], tb))
+                x = tb
+                y = su[top]
+                top -= 1
                 continue
-            if f[2] == 1:
-                pairs.append((f[3], f[4]))
-                f[2] = 2
-                stk.append([f[4], f[1], 0, 0, 0])
+            if label[x] == EVEN:
+                mv = mate[x]
+                pmv = parent[mv]
+                pairs.append((mv, pmv))
+                x = pmv
                 continue
-            stk.pop()
+            sb = source_bridge[x]
+            top += 1
+            su[top] = y
+            ssb[top] = sb
+            stb[top] = target_bridge[x]
+            y = mate[x]
+            x = sb
 
     def augment_g(self, h_edges):
         """Unfold H-edges to G and augment."""
@@ -421,16 +615,31 @@ class GabowOptimized:
 
     def phase_2(self):
         """Find all SAPs in H, unfold and augment."""
-        for v in self.tree_nodes:
-            self.rep[v] = self.find_dbase(v)
-            self.label_h[v] = UNLABELED
-            self.parent_h_src[v] = NIL
-            self.parent_h_tgt[v] = NIL
-            self.bridge_h_src[v] = NIL
-            self.bridge_h_tgt[v] = NIL
-            self.dir_h[v] = 0
-            self.even_time_h[v] = 0
-            self.db2_par[v] = v
+        # The H buffers live across phases; only the vertices phase_1 put
+        # in the forest (tree_nodes) were written, so only those are reset.
+        tree_nodes = self.tree_nodes
+        find_dbase = self.find_dbase
+        rep = self.rep
+        label_h = self.label_h
+        parent_h_src = self.parent_h_src
+        parent_h_tgt = self.parent_h_tgt
+        bridge_h_src = self.bridge_h_src
+        bridge_h_tgt = self.bridge_h_tgt
+        dir_h = self.dir_h
+        even_time_h = self.even_time_h
+        db2_par = self.db2_par
+        db2_rank = self.db2_rank
+        for v in tree_nodes:
+            rep[v] = find_dbase(v)
+            label_h[v] = UNLABELED
+            parent_h_src[v] = NIL
+            parent_h_tgt[v] = NIL
+            bridge_h_src[v] = NIL
+            bridge_h_tgt[v] = NIL
+            dir_h[v] = 0
+            even_time_h[v] = 0
+            db2_par[v] = v
+            db2_rank[v] = 0
         self.t_h = 0
 
         all_paths = []
@@ -454,11 +663,12 @@ class GabowOptimized:
         for he in all_paths:
             self.augment_g(he)
 
-        for v in self.tree_nodes:
-            db = self.find_dbase(v)
-            self.contracted_into[db].clear()
-            self.contracted_into[v].clear()
-            self.mate_h[v] = NIL
+        contracted_into = self.contracted_into
+        mate_h = self.mate_h
+        for v in tree_nodes:
+            contracted_into[find_dbase(v)].clear()
+            contracted_into[v].clear()
+            mate_h[v] = NIL
 
     # ================================================================
     #                      MAIN ENTRY POINT
@@ -470,7 +680,7 @@ class GabowOptimized:
         for u in range(self.n):
             if self.mate[u] != NIL:
                 continue
-            for v in self.graph[u]:
+            for v in self.edges[self.adj_start[u]:self.adj_start[u + 1]]:
                 if self.mate[v] == NIL:
                     self.mate[u] = v
                     self.mate[v] = u
@@ -481,59 +691,92 @@ class GabowOptimized:
     def _greedy_init_md(self):
         cnt = 0
         n = self.n
-        deg = [len(self.graph[u]) for u in range(n)]
-        order = sorted(range(n), key=lambda x: (deg[x], x))
+        adj_start = self.adj_start
+        deg = [adj_start[u + 1] - adj_start[u] for u in range(n)]
+        order = sorted(range(n), key=deg.__getitem__)
         for u in order:
             if self.mate[u] != NIL:
                 continue
             best = NIL
-            best_deg = float('inf')
-            for v in self.graph[u]:
+            best_deg = n
+            for v in self.edges[adj_start[u]:adj_start[u + 1]]:
                 if self.mate[v] == NIL and deg[v] < best_deg:
                     best = v
                     best_deg = deg[v]
+                    if best_deg == 1:
+                        break
             if best >= 0:
                 self.mate[u] = best
                 self.mate[best] = u
                 cnt += 1
         return cnt
 
+    def _greedy_init_ks(self):
+        # Karp-Sipser: a vertex with a single free neighbor can always be
+        # matched to it without losing optimality, so clear those first
+        # (cascading as neighbors lose free neighbors), then finish with
+        # the min-degree greedy.
+        cnt = 0
+        n = self.n
+        mate = self.mate
+        edges = self.edges
+        adj_start = self.adj_start
+        deg = [adj_start[u + 1] - adj_start[u] for u in range(n)]  # free nbrs
+        pending = [u for u in range(n) if deg[u] == 1]
+        while pending:
+            u = pending.pop()
+            if mate[u] != NIL or deg[u] != 1:
+                continue
+            for v in edges[adj_start[u]:adj_start[u + 1]]:
+                if mate[v] == NIL:
+                    break
+            mate[u] = v
+            mate[v] = u
+            cnt += 1
+            for w in edges[adj_start[v]:adj_start[v + 1]]:
+                if mate[w] == NIL:
+                    deg[w] -= 1
+                    if deg[w] == 1:
+                        pending.append(w)
+        return cnt + self._greedy_init_md()
+
     def maximum_matching(self, greedy_mode=0):
         if greedy_mode == 1:
             self.greedy_size = self._greedy_init()
         elif greedy_mode == 2:
             self.greedy_size = self._greedy_init_md()
+        elif greedy_mode == 3:
+            self.greedy_size = self._greedy_init_ks()
 
         while self.phase_1():
             self.phase_2()
 
-        result = []
-        for u in range(self.n):
-            if self.mate[u] != NIL and self.mate[u] > u:
-                result.append((u, self.mate[u]))
-        result.sort()
-        return result
+        return [(u, v) for u, v in enumerate(self.mate) if v > u]
 
 
 # ================================================================
 #                    VALIDATION AND MAIN
 # ================================================================
 
-def validate_matching(n, graph, matching):
+def validate_matching(n, edges_flat, adj_start, matching):
     deg = [0] * n
     errors = 0
     for u, v in matching:
-        idx = bisect_left(graph[u], v)
-        if idx >= len(graph[u]) or graph[u][idx] != v:
+        lo, hi = adj_start[u], adj_start[u + 1]
+        idx = bisect_left(edges_flat, v, lo, hi)
+        if idx == hi or edges_flat[idx] != v:
             print(f"ERROR: Edge ({u}, {v}) not in graph!", file=sys.stderr)
             errors += 1
         deg[u] += 1
         deg[v] += 1
-    for i in range(n):
-        if deg[i] > 1:
-            print(f"ERROR: Vertex {i} in {deg[i]} edges!", file=sys.stderr)
-            errors += 1
-    matched = sum(1 for d in deg if d > 0)
+    # max() and count() run in C; the per-vertex scan only runs to
+    # report an actual violation
+    if max(deg, default=0) > 1:
+        for i in range(n):
+            if deg[i] > 1:
+                print(f"ERROR: Vertex {i} in {deg[i]} edges!", file=sys.stderr)
+                errors += 1
+    matched = n - deg.count(0)
     print(f"\n=== Validation Report ===")
     print(f"Matching size: {len(matching)}")
     print(f"Matched vertices: {matched}")
@@ -557,7 +800,7 @@ def main():
     print("==================================================================\n")
 
     if len(sys.argv) < 2:
-        print(f"Usage: {sys.argv[0]} <filename> [--greedy|--greedy-md]")
+        print(f"Usage: {sys.argv[0]} <filename> [--greedy|--greedy-md|--greedy-ks]")
         sys.exit(1)
 
     greedy_mode = 0
@@ -566,6 +809,8 @@ def main():
             greedy_mode = 1
         elif arg == "--greedy-md":
             greedy_mode = 2
+        elif arg == "--greedy-ks":
+            greedy_mode = 3
 
     n, edges = load_graph(sys.argv[1])
     print(f"Graph: {n} vertices, {len(edges)} edges")
@@ -575,7 +820,7 @@ def main():
     matching = gabow.maximum_matching(greedy_mode)
     t1 = time.time()
 
-    validate_matching(n, gabow.graph, matching)
+    validate_matching(n, gabow.edges, gabow.adj_start, matching)
 
     print(f"Matching size: {len(matching)}")
     if greedy_mode > 0:
@@ -76,10 +76,17 @@ class GabowOptimized:
 
     # ---- union-find: dbase ----
     def find_dbase(self, v):
-        while self.dbase_par[v] != v:
-            self.dbase_par[v] = self.dbase_par[self.dbase_par[v]]
-            v = self.dbase_par[v]
-        return v
+        par = self.dbase_par
+        r = par[v]
+        if r == v:
+            return v
+        while par[r] != r:
+            r = par[r]
+        while v != r:
+            nxt = par[v]
+            par[v] = r
+            v = nxt
+        return r
 
     def union_dbase(self, a, b):
         a = self.find_dbase(a)
@@ -95,10 +102,17 @@ class GabowOptimized:
 
     # ---- union-find: dbase2 ----
     def find_db2(self, v):
-        while self.db2_par[v] != v:
-            self.db2_par[v] = self.db2_par[self.db2_par[v]]
-            v = self.db2_par[v]
-        return v
+        par = self.db2_par
+        r = par[v]
+        if r == v:
+            return v
+        while par[r] != r:
+            r = par[r]
+        while v != r:
+            nxt = par[v]
+            par[v] = r
+            v = nxt
+        return r
 
     def union_db2(self, a, b):
         a = self.find_db2(a)
@@ -162,12 +176,14 @@ class GabowOptimized:
     # ================================================================
     def phase_1(self):
         self.delta = 0
-        self.tree_nodes = []
         for q in self.level_queue:
             q.clear()
         dunions = []
 
-        for i in range(self.n):
+        # Only the previous phase's tree nodes were labeled, parented,
+        # bridged or unioned; every other vertex still holds its __init__
+        # value, so resetting those is enough
+        for i in self.tree_nodes:
             self.base_par[i] = i
             self.dbase_par[i] = i
             self.label[i] = UNLABELED
@@ -175,6 +191,7 @@ class GabowOptimized:
             self.source_bridge[i] = NIL
             self.target_bridge[i] = NIL
             self.in_tree[i] = False
+        self.tree_nodes = []
 
         for v in range(self.n):
             if self.mate[v] == NIL:
@@ -254,6 +271,10 @@ class GabowOptimized:
                 else:
                     self.union_dbase(a, b)
             dunions.clear()
+            # Edges are only queued at levels d and d + 1, so an empty
+            # d + 1 means every later level stays empty too
+            if not self.level_queue[d + 1]:
+                break
             self.delta += 1
 
         return False
@@ -475,12 +496,7 @@ class GabowOptimized:
         while self.phase_1():
             self.phase_2()
 
-        result = []
-        for u in range(self.n):
-            if self.mate[u] != NIL and self.mate[u] > u:
-                result.append((u, self.mate[u]))
-        result.sort()
-        return result
+        return [(u, v) for u, v in enumerate(self.mate) if v > u]
 
 
 # ================================================================
@@ -497,11 +513,12 @@ def validate_matching(n, graph, matching):
             errors += 1
         deg[u] += 1
         deg[v] += 1
-    for i in range(n):
-        if deg[i] > 1:
-            print(f"ERROR: Vertex {i} in {deg[i]} edges!", file=sys.stderr)
-            errors += 1
-    matched = sum(1 for d in deg if d > 0)
+    if max(deg, default=0) > 1:
+        for i in range(n):
+            if deg[i] > 1:
+                print(f"ERROR: Vertex {i} in {deg[i]} edges!", file=sys.stderr)
+                errors += 1
+    matched = n - deg.count(0)
     print(f"\n=== Validation Report ===")
     print(f"Matching size: {len(matching)}")
     print(f"Matched vertices: {matched}")
@@ -31,8 +31,16 @@ class GabowOptimized:
             if 0 <= u < n and 0 <= v < n and u != v:
                 self.graph[u].append(v)
                 self.graph[v].append(u)
-        for i in range(n):
-            self.graph[i] = sorted(set(self.graph[i]))
+        # Sort, then drop parallel edges by compacting adjacent duplicates
+        # in place (no intermediate set per vertex)
+        for adj in self.graph:
+            adj.sort()
+            j = 0
+            for k in range(1, len(adj)):
+                if adj[k] != adj[j]:
+                    j += 1
+                    adj[j] = adj[k]
+            del adj[j + 1:]
 
         self.mate = [NIL] * n
         self.label = [UNLABELED] * n
@@ -49,7 +57,9 @@ class GabowOptimized:
         self.tree_nodes = []
         self.delta = 0
 
-        self.h_adj = [[] for _ in range(n)]  # precomputed H-adjacency
+        # Precomputed H-adjacency, flat per H-vertex: h_adj[vh] holds the
+        # G-edges (u, w) out of vh as consecutive entries u, w
+        self.h_adj = [[] for _ in range(n)]
 
         self.rep = [0] * n
         self.mate_h = [NIL] * n
@@ -78,10 +88,17 @@ class GabowOptimized:
 
     # ---- union-find: dbase ----
     def find_dbase(self, v):
-        while self.dbase_par[v] != v:
-            self.dbase_par[v] = self.dbase_par[self.dbase_par[v]]
-            v = self.dbase_par[v]
-        return v
+        par = self.dbase_par
+        r = par[v]
+        if r == v:
+            return v
+        while par[r] != r:
+            r = par[r]
+        while v != r:
+            nxt = par[v]
+            par[v] = r
+            v = nxt
+        return r
 
     def union_dbase(self, a, b):
         a = self.find_dbase(a)
@@ -97,10 +114,17 @@ class GabowOptimized:
 
     # ---- union-find: dbase2 ----
     def find_db2(self, v):
-        while self.db2_par[v] != v:
-            self.db2_par[v] = self.db2_par[self.db2_par[v]]
-            v = self.db2_par[v]
-        return v
+        par = self.db2_par
+        r = par[v]
+        if r == v:
+            return v
+        while par[r] != r:
+            r = par[r]
+        while v != r:
+            nxt = par[v]
+            par[v] = r
+            v = nxt
+        return r
 
     def union_db2(self, a, b):
         a = self.find_db2(a)
@@ -136,14 +160,16 @@ class GabowOptimized:
                 self.lca_tag2[hy] = ep
 
     # ---- shrink_path ----
-    def shrink_path(self, b, x, y, dunions):
+    def shrink_path(self, b, x, y, du_a, du_b):
         v = self.find_base(x)
         while v != b:
             self.union_base(v, b, b)
-            dunions.append((v, b))
+            du_a.append(v)
+            du_b.append(b)
             mv = self.mate[v]
             self.union_base(mv, b, b)
-            dunions.append((mv, b))
+            du_a.append(mv)
+            du_b.append(b)
             self.base_par[b] = b
             self.source_bridge[mv] = x
             self.target_bridge[mv] = y
@@ -157,19 +183,26 @@ class GabowOptimized:
                 elif self.label[bw] == EVEN:
                     self.level_queue[d].append((mv, w))
             v = self.find_base(self.parent[mv])
-        dunions.append((b, b))
+        du_a.append(b)
+        du_b.append(b)
 
     # ================================================================
     #                          PHASE 1
     # ================================================================
     def phase_1(self):
         self.delta = 0
-        self.tree_nodes = []
         for q in self.level_queue:
             q.clear()
-        dunions = []
-
-        for i in range(self.n):
+        # dbase unions are deferred to the end of each level, so H at the
+        # SAP level only contracts blossoms from earlier levels. They are
+        # logged as parallel (a, b) lists, a == b marking make_rep(b).
+        du_a = []
+        du_b = []
+
+        # Only the previous phase's tree nodes were labeled, parented,
+        # bridged or unioned; every other vertex still holds its __init__
+        # value, so resetting those is enough
+        for i in self.tree_nodes:
             self.base_par[i] = i
             self.dbase_par[i] = i
             self.label[i] = UNLABELED
@@ -177,6 +210,7 @@ class GabowOptimized:
             self.source_bridge[i] = NIL
             self.target_bridge[i] = NIL
             self.in_tree[i] = False
+        self.tree_nodes = []
 
         for v in range(self.n):
             if self.mate[v] == NIL:
@@ -229,8 +263,8 @@ class GabowOptimized:
                 elif self.label[bu] == EVEN:
                     lca = self.find_lca(z, u)
                     if lca != NIL:
-                        self.shrink_path(lca, z, u, dunions)
-                        self.shrink_path(lca, u, z, dunions)
+                        self.shrink_path(lca, z, u, du_a, du_b)
+                        self.shrink_path(lca, u, z, du_a, du_b)
                     else:
                         found_sap = True
 
@@ -253,15 +287,22 @@ class GabowOptimized:
                         if self.mate[u] == w: continue
                         wh = self.find_dbase(w)
                         if uh == wh: continue
-                        self.h_adj[uh].append((u, w))
+                        hu = self.h_adj[uh]
+                        hu.append(u)
+                        hu.append(w)
                 return True
 
-            for a, b in dunions:
+            for a, b in zip(du_a, du_b):
                 if a == b:
                     self.make_rep_dbase(a)
                 else:
                     self.union_dbase(a, b)
-            dunions.clear()
+            du_a.clear()
+            du_b.clear()
+            # Edges are only queued at levels d and d + 1, so an empty
+            # d + 1 means every later level stays empty too
+            if not self.level_queue[d + 1]:
+                break
             self.delta += 1
 
         return False
@@ -272,7 +313,7 @@ class GabowOptimized:
 
     def find_ap_hg(self, root_vh):
         """Iterative DFS in H using precomputed h_adj."""
-        # Stack: [vh, edge_idx]
+        # Stack: [vh, edge_idx]; edge_idx steps by 2 over the flat pairs
         stk = [[root_vh, 0]]
 
         while stk:
@@ -282,8 +323,10 @@ class GabowOptimized:
 
             found_next = False
             while f[1] < len(adj):
-                v, w = adj[f[1]]
-                f[1] += 1
+                k = f[1]
+                v = adj[k]
+                w = adj[k + 1]
+                f[1] = k + 2
 
                 uh = self.find_db2(self.rep[w])
                 if uh == self.find_db2(vh): continue
@@ -450,10 +493,9 @@ class GabowOptimized:
         for he in all_paths:
             self.augment_g(he)
 
-        # Clean up
+        # Clean up. Entries were only added under dbase roots, which are
+        # tree nodes themselves, so clearing each tree node's list suffices.
         for v in self.tree_nodes:
-            db = self.find_dbase(v)
-            self.h_adj[db].clear()
             self.h_adj[v].clear()
             self.mate_h[v] = NIL
 
@@ -472,12 +514,7 @@ class GabowOptimized:
         while self.phase_1():
             self.phase_2()
 
-        result = []
-        for u in range(self.n):
-            if self.mate[u] != NIL and self.mate[u] > u:
-                result.append((u, self.mate[u]))
-        result.sort()
-        return result
+        return [(u, v) for u, v in enumerate(self.mate) if v > u]
 
 
 # ================================================================
@@ -494,11 +531,12 @@ def validate_matching(n, graph, matching):
             errors += 1
         deg[u] += 1
         deg[v] += 1
-    for i in range(n):
-        if deg[i] > 1:
-            print(f"ERROR: Vertex {i} in {deg[i]} edges!", file=sys.stderr)
-            errors += 1
-    matched = sum(1 for d in deg if d > 0)
+    if max(deg, default=0) > 1:
+        for i in range(n):
+            if deg[i] > 1:
+                print(f"ERROR: Vertex {i} in {deg[i]} edges!", file=sys.stderr)
+                errors += 1
+    matched = n - deg.count(0)
     print(f"\n=== Validation Report ===")
     print(f"Matching size: {len(matching)}")
     print(f"Matched vertices: {matched}")
@@ -9,19 +9,27 @@ for augmentation through blossoms.
 Forest search: each iteration labels ALL free vertices as EVEN roots
 simultaneously and grows a search forest. An augmenting path is found
 when two different trees meet (EVEN-EVEN edge across trees, detected
-by find_lca returning NIL). One augmentation per iteration, then full
-reset and repeat until no augmenting path exists.
+by root ids). Each such path is augmented and both trees are retired;
+the forest keeps growing from the remaining trees, so one iteration can
+augment many vertex-disjoint paths. Then reset and repeat until an
+iteration finds no augmenting path.
 
-Complexity: O(V * E) – each iteration does O(E) work, at most V/2
-augmentations total.
+Complexity: O(V * E) – each iteration does O(E) work and every one but
+the last augments, so there are at most V/2 + 1 iterations.
 
 All integers, no hash containers, fully deterministic.
 
-Python implementation – faithful translation of the C++ version.
+Python implementation – derived from the C++ version, which it follows
+for the blossom machinery. Python-only divergences:
+- each iteration augments every vertex-disjoint path its forest finds,
+  where C++ stops at the first augmentation;
+- with the opt-in bipartite mode, bipartite inputs take a search
+  without the base/LCA/shrink steps.
 """
 
 import sys
 import time
+from bisect import bisect_left
 
 NIL = -1
 UNLABELED = 0
@@ -32,13 +40,18 @@ ODD = 2
 class GabowSimple:
     def __init__(self, n, edges):
         self.n = n
-        self.graph = [[] for _ in range(n)]
+        adj = [[] for _ in range(n)]
         for u, v in edges:
             if 0 <= u < n and 0 <= v < n and u != v:
-                self.graph[u].append(v)
-                self.graph[v].append(u)
+                adj[u].append(v)
+                adj[v].append(u)
+
+        # CSR adjacency: neighbors of v are edges[adj_start[v]:adj_start[v + 1]]
+        self.adj_start = [0] * (n + 1)
+        self.edges = []
         for i in range(n):
-            self.graph[i] = sorted(set(self.graph[i]))
+            self.edges.extend(sorted(set(adj[i])))
+            self.adj_start[i + 1] = len(self.edges)
 
         self.mate = [NIL] * n
         self.base = list(range(n))
@@ -50,15 +63,58 @@ class GabowSimple:
         self.lca_tag2 = [0] * n
         self.lca_epoch = 0
         self.greedy_size = 0
+        # Vertices labeled by the last search: EVEN ones sit in its queue,
+        # ODD ones in odd. Only they can hold non-initial state.
+        self.queue = []
+        self.odd = []
+        # root[v]: free vertex whose tree holds v; dead[r]: r's tree was
+        # augmented this search and is skipped from then on
+        self.root = [NIL] * n
+        self.dead = bytearray(n)
+        # trace_path continuation stack, one list per field, indexed by a
+        # top counter; each entry belongs to a distinct bridged vertex
+        self.tr_u = [0] * (n + 1)
+        self.tr_sb = [0] * (n + 1)
+        self.tr_tb = [0] * (n + 1)
+        # Set by maximum_matching(bipartite=True) when a 2-coloring exists:
+        # with no odd cycle no blossom ever forms, so the search can skip
+        # the base/LCA machinery entirely
+        self.bipartite = False
+
+    # ---- Bipartiteness test ----
+
+    def two_color(self):
+        """Return side[v] in {1, 2} if the graph is bipartite, else None."""
+        n = self.n
+        edges = self.edges
+        adj_start = self.adj_start
+        side = bytearray(n)
+        for s in range(n):
+            if side[s]:
+                continue
+            side[s] = 1
+            stack = [s]
+            while stack:
+                u = stack.pop()
+                su = side[u]
+                for w in edges[adj_start[u]:adj_start[u + 1]]:
+                    if side[w] == 0:
+                        side[w] = 3 - su
+                        stack.append(w)
+                    elif side[w] == su:
+                        return None  # odd cycle
+        return side
 
     # ---- Greedy initialization ----
 
     def greedy_init(self):
         cnt = 0
+        edges = self.edges
+        adj_start = self.adj_start
         for u in range(self.n):
             if self.mate[u] != NIL:
                 continue
-            for v in self.graph[u]:
+            for v in edges[adj_start[u]:adj_start[u + 1]]:
                 if self.mate[v] == NIL:
                     self.mate[u] = v
                     self.mate[v] = u
@@ -69,17 +125,21 @@ class GabowSimple:
     def greedy_init_md(self):
         cnt = 0
         n = self.n
-        deg = [len(self.graph[u]) for u in range(n)]
-        order = sorted(range(n), key=lambda x: (deg[x], x))
+        edges = self.edges
+        adj_start = self.adj_start
+        deg = [adj_start[u + 1] - adj_start[u] for u in range(n)]
+        order = sorted(range(n), key=deg.__getitem__)
         for u in order:
             if self.mate[u] != NIL:
                 continue
             best = NIL
-            best_deg = float('inf')
-            for v in self.graph[u]:
+            best_deg = n
+            for v in edges[adj_start[u]:adj_start[u + 1]]:
                 if self.mate[v] == NIL and deg[v] < best_deg:
                     best = v
                     best_deg = deg[v]
+                    if best_deg == 1:
+                        break
             if best >= 0:
                 self.mate[u] = best
                 self.mate[best] = u
@@ -89,9 +149,16 @@ class GabowSimple:
     # ---- Union-find base with path halving ----
 
     def find_base(self, v):
-        while self.base[v] != v:
-            self.base[v] = self.base[self.base[v]]
-            v = self.base[v]
+        # base[] is a forest: shrink_path only links set roots to the lca and
+        # pins base[lca] = lca, so the walk always ends at a fixed point and
+        # needs no visited guard.
+        base = self.base
+        p = base[v]
+        while p != v:
+            gp = base[p]
+            base[v] = gp
+            v = gp
+            p = base[v]
         return v
 
     # ---- Interleaved LCA using epoch tags ----
@@ -99,87 +166,97 @@ class GabowSimple:
     def find_lca(self, u, v):
         self.lca_epoch += 1
         ep = self.lca_epoch
-        hx = self.find_base(u)
-        hy = self.find_base(v)
-        self.lca_tag1[hx] = ep
-        self.lca_tag2[hy] = ep
+        tag1 = self.lca_tag1
+        tag2 = self.lca_tag2
+        mate = self.mate
+        parent = self.parent
+        find_base = self.find_base
+        hx = find_base(u)
+        hy = find_base(v)
+        tag1[hx] = ep
+        tag2[hy] = ep
         while True:
-            if self.lca_tag1[hy] == ep:
+            if tag1[hy] == ep:
                 return hy
-            if self.lca_tag2[hx] == ep:
+            if tag2[hx] == ep:
                 return hx
-            hxr = (self.mate[hx] == NIL)
-            hyr = (self.mate[hy] == NIL)
-            if hxr and hyr:
+            mx = mate[hx]
+            my = mate[hy]
+            if mx == NIL and my == NIL:
                 return NIL  # different trees
-            if not hxr:
-                hx = self.find_base(self.parent[self.mate[hx]])
-                self.lca_tag1[hx] = ep
-            if not hyr:
-                hy = self.find_base(self.parent[self.mate[hy]])
-                self.lca_tag2[hy] = ep
+            if mx != NIL:
+                hx = find_base(parent[mx])
+                tag1[hx] = ep
+            if my != NIL:
+                hy = find_base(parent[my])
+                tag2[hy] = ep
 
     # ---- Path-only contraction ----
 
-    def shrink_path(self, lca, x, y, queue, qtail):
-        v = self.find_base(x)
+    def shrink_path(self, lca, x, y, queue):
+        find_base = self.find_base
+        base = self.base
+        mate = self.mate
+        label = self.label
+        parent = self.parent
+        v = find_base(x)
         while v != lca:
-            mv = self.mate[v]
-            self.base[self.find_base(v)] = lca
-            self.base[self.find_base(mv)] = lca
-            self.base[lca] = lca
+            mv = mate[v]
+            base[find_base(v)] = lca
+            base[find_base(mv)] = lca
+            base[lca] = lca
             self.bridge_src[mv] = x
             self.bridge_tgt[mv] = y
-            if self.label[mv] != EVEN:
-                self.label[mv] = EVEN
-                queue[qtail[0]] = mv
-                qtail[0] += 1
-            v = self.find_base(self.parent[mv])
-        return qtail
+            if label[mv] != EVEN:
+                label[mv] = EVEN
+                queue.append(mv)
+            v = find_base(parent[mv])
 
     # ---- Trace path for augmentation ----
 
     def trace_path(self, v, u, pairs):
         """Trace from vertex v to vertex u (or to root if u==NIL),
         collecting edge pairs for augmentation."""
-        # Iterative with explicit stack
-        # Frame: (v, u, phase, sb, tb)
-        stack = [(v, u, 0, 0, 0)]
-
-        while stack:
-            fv, fu, phase, sb, tb = stack[-1]
-
-            if fv == fu:
-                stack.pop()
-                continue
-
-            if phase == 0:
-                if self.bridge_src[fv] == NIL:
-                    # Originally EVEN vertex (no bridge)
-                    if self.mate[fv] == NIL:
-                        # Root (free vertex) – done
-                        stack.pop()
-                        continue
-                    mv = self.mate[fv]
-                    pmv = self.parent[mv]
-                    pairs.append((mv, pmv))
-                    stack[-1] = (pmv, fu, 0, 0, 0)
-                    continue
-                # Has bridge – originally ODD, absorbed into blossom
-                sb = self.bridge_src[fv]
-                tb = self.bridge_tgt[fv]
-                stack[-1] = (fv, fu, 1, sb, tb)
-                stack.append((sb, self.mate[fv], 0, 0, 0))
+        # A bridged vertex x splits into trace(sb, mate(x)) then trace(tb, u).
+        # The first runs now; the second is saved as (u, sb, tb) in
+        # tr_u/tr_sb/tr_tb[top] and resumed, after emitting the bridge
+        # (sb, tb), once the first reaches its end.
+        mate = self.mate
+        parent = self.parent
+        bridge_src = self.bridge_src
+        bridge_tgt = self.bridge_tgt
+        su = self.tr_u
+        ssb = self.tr_sb
+        stb = self.tr_tb
+        top = -1
+        x = v
+        y = u
+        while True:
+            if x == y or (bridge_src[x] == NIL and mate[x] == NIL):
+                # Reached the target, or the root (free vertex)
+                if top < 0:
+                    return
+                tb = stb[top]
+                pairs.append((ssb[top], tb))
+                x = tb
+                y = su[top]
+                top -= 1
                 continue
-
-            if phase == 1:
-                pairs.append((sb, tb))
-                stack[-1] = (fv, fu, 2, sb, tb)
-                stack.append((tb, fu, 0, 0, 0))
+            sb = bridge_src[x]
+            if sb == NIL:
+                # Originally EVEN vertex (no bridge)
+                mv = mate[x]
+                pmv = parent[mv]
+                pairs.append((mv, pmv))
+                x = pmv
                 continue
-
-            # phase == 2
-            stack.pop()
+            # Has bridge – originally ODD, absorbed into blossom
+            top += 1
+            su[top] = y
+            ssb[top] = sb
+            stb[top] = bridge_tgt[x]
+            y = mate[x]
+            x = sb
 
     # ---- Augment along two-sided path ----
 
@@ -195,97 +272,187 @@ class GabowSimple:
 
     def find_and_augment(self):
         n = self.n
-        # Reset per-iteration state
-        for i in range(n):
-            self.base[i] = i
-            self.parent[i] = NIL
-            self.label[i] = UNLABELED
-            self.bridge_src[i] = NIL
-            self.bridge_tgt[i] = NIL
-
-        queue = [0] * n
+        edges = self.edges
+        adj_start = self.adj_start
+        mate = self.mate
+        base = self.base
+        parent = self.parent
+        label = self.label
+        find_base = self.find_base
+
+        # Reset per-iteration state in O(touched), not O(n): base, parent,
+        # label and the bridges are only written for labeled vertices
+        bridge_src = self.bridge_src
+        bridge_tgt = self.bridge_tgt
+        root = self.root
+        dead = self.dead
+        queue = self.queue
+        odd = self.odd
+        for touched in (queue, odd):
+            for v in touched:
+                base[v] = v
+                parent[v] = NIL
+                label[v] = UNLABELED
+                bridge_src[v] = NIL
+                bridge_tgt[v] = NIL
+                root[v] = NIL
+                dead[v] = 0
+            touched.clear()
+
+        # FIFO: the queue is append-only within an iteration (a vertex turns
+        # EVEN at most once) and qhead is its head, so shrink_path can push
+        # with a plain append instead of sharing a boxed tail counter.
         qhead = 0
-        qtail = [0]  # use list for mutability in shrink_path
 
         # All free vertices become EVEN roots
         for v in range(n):
-            if self.mate[v] == NIL:
-                self.label[v] = EVEN
-                queue[qtail[0]] = v
-                qtail[0] += 1
-
-        while qhead < qtail[0]:
+            if mate[v] == NIL:
+                label[v] = EVEN
+                root[v] = v
+                queue.append(v)
+
+        if self.bipartite:
+            return self.grow_bipartite(queue)
+
+        # Several trees can augment in one search: once a tree's path is
+        # augmented its labels are stale, so the tree is marked dead and
+        # the forest keeps growing from the others.
+        augmented = False
+        while qhead < len(queue):
             u = queue[qhead]
             qhead += 1
-            # Check that u is still effectively EVEN
-            if self.label[self.find_base(u)] != EVEN:
+            # Check that u is still effectively EVEN, in a live tree
+            bu = find_base(u)
+            ru = root[u]
+            if label[bu] != EVEN or dead[ru]:
                 continue
 
-            for v in self.graph[u]:
-                bu = self.find_base(u)
-                bv = self.find_base(v)
+            mu = mate[u]
+            for v in edges[adj_start[u]:adj_start[u + 1]]:
+                # bu only changes when a blossom is shrunk below
+                bv = find_base(v)
                 if bu == bv:
                     continue  # same blossom
-                if v == self.mate[u]:
+                if v == mu:
                     continue  # skip matching edge
 
-                if self.label[bv] == UNLABELED:
+                lv = label[bv]
+                if lv == UNLABELED:
                     # v is matched and unlabeled -> grow step
-                    self.label[v] = ODD
-                    self.parent[v] = u
-                    w = self.mate[v]
-                    self.label[w] = EVEN
-                    queue[qtail[0]] = w
-                    qtail[0] += 1
-
-                elif self.label[bv] == EVEN:
+                    label[v] = ODD
+                    parent[v] = u
+                    odd.append(v)
+                    root[v] = ru
+                    w = mate[v]
+                    label[w] = EVEN
+                    root[w] = ru
+                    queue.append(w)
+
+                elif lv == EVEN:
                     # EVEN-EVEN edge: blossom or augmenting path
-                    lca = self.find_lca(u, v)
-                    if lca != NIL:
+                    rv = root[v]
+                    if dead[rv]:
+                        continue
+                    if rv == ru:
                         # Same tree -> blossom contraction
-                        self.shrink_path(lca, u, v, queue, qtail)
-                        self.shrink_path(lca, v, u, queue, qtail)
+                        lca = self.find_lca(u, v)
+                        self.shrink_path(lca, u, v, queue)
+                        self.shrink_path(lca, v, u, queue)
+                        bu = find_base(u)
                     else:
                         # Different trees -> augmenting path!
                         self.augment_two_sides(u, v)
-                        return True
+                        dead[ru] = 1
+                        dead[rv] = 1
+                        augmented = True
+                        break
                 # label[bv] == ODD: ignore
 
-        return False
+        return augmented
+
+    def grow_bipartite(self, queue):
+        """Forest search of find_and_augment for a bipartite graph."""
+        # With no odd cycle every vertex is its own base, an EVEN-EVEN edge
+        # always joins two trees, and no bridge is ever recorded, so the
+        # find_base, LCA and shrink steps all drop out.
+        edges = self.edges
+        adj_start = self.adj_start
+        mate = self.mate
+        parent = self.parent
+        label = self.label
+        root = self.root
+        dead = self.dead
+        odd = self.odd
+        qhead = 0
+        augmented = False
+        while qhead < len(queue):
+            u = queue[qhead]
+            qhead += 1
+            ru = root[u]
+            if dead[ru]:
+                continue
+
+            mu = mate[u]
+            for v in edges[adj_start[u]:adj_start[u + 1]]:
+                if v == mu:
+                    continue
+                lv = label[v]
+                if lv == UNLABELED:
+                    label[v] = ODD
+                    parent[v] = u
+                    odd.append(v)
+                    root[v] = ru
+                    w = mate[v]
+                    label[w] = EVEN
+                    root[w] = ru
+                    queue.append(w)
+                elif lv == EVEN:
+                    rv = root[v]
+                    if dead[rv]:
+                        continue
+                    self.augment_two_sides(u, v)
+                    dead[ru] = 1
+                    dead[rv] = 1
+                    augmented = True
+                    break
+
+        return augmented
 
-    def maximum_matching(self, greedy_mode=0):
+    def maximum_matching(self, greedy_mode=0, bipartite=False):
         if greedy_mode == 1:
             self.greedy_size = self.greedy_init()
         elif greedy_mode == 2:
             self.greedy_size = self.greedy_init_md()
 
+        self.bipartite = bipartite and self.two_color() is not None
+
         while self.find_and_augment():
             pass
 
-        matching = []
-        for u in range(self.n):
-            if self.mate[u] != NIL and self.mate[u] > u:
-                matching.append((u, self.mate[u]))
-        matching.sort()
-        return matching
+        return [(u, v) for u, v in enumerate(self.mate) if v > u]
 
 
 # ---- Validation ----
 
-def validate_matching(n, graph, matching):
+def validate_matching(n, edges_flat, adj_start, matching):
     deg = [0] * n
     errors = 0
     for u, v in matching:
-        if v not in graph[u]:
+        lo, hi = adj_start[u], adj_start[u + 1]
+        idx = bisect_left(edges_flat, v, lo, hi)
+        if idx == hi or edges_flat[idx] != v:
             print(f"ERROR: Edge ({u},{v}) not in graph!", file=sys.stderr)
             errors += 1
         deg[u] += 1
         deg[v] += 1
-    for i in range(n):
-        if deg[i] > 1:
-            print(f"ERROR: Vertex {i} in {deg[i]} edges!", file=sys.stderr)
-            errors += 1
-    mt = sum(1 for d in deg if d > 0)
+    # max() and count() run in C; the per-vertex scan only runs to
+    # report an actual violation
+    if max(deg, default=0) > 1:
+        for i in range(n):
+            if deg[i] > 1:
+                print(f"ERROR: Vertex {i} in {deg[i]} edges!", file=sys.stderr)
+                errors += 1
+    mt = n - deg.count(0)
     status = "VALIDATION FAILED" if errors > 0 else "VALIDATION PASSED"
     print(f"\n=== Validation Report ===\n"
           f"Matching size: {len(matching)}\n"
@@ -316,25 +483,28 @@ def main():
     print()
 
     if len(sys.argv) < 2:
-        print(f"Usage: python {sys.argv[0]} <filename> [--greedy|--greedy-md]")
+        print(f"Usage: python {sys.argv[0]} <filename> [--greedy|--greedy-md] [--bipartite]")
         sys.exit(1)
 
     greedy_mode = 0
+    bipartite = False
     for arg in sys.argv[2:]:
         if arg == "--greedy":
             greedy_mode = 1
         elif arg == "--greedy-md":
             greedy_mode = 2
+        elif arg == "--bipartite":
+            bipartite = True
 
     n, edges = load_graph(sys.argv[1])
     print(f"Graph: {n} vertices, {len(edges)} edges")
 
     t0 = time.time()
     gabow = GabowSimple(n, edges)
-    matching = gabow.maximum_matching(greedy_mode)
+    matching = gabow.maximum_matching(greedy_mode, bipartite)
     t1 = time.time()
 
-    validate_matching(n, gabow.graph, matching)
+    validate_matching(n, gabow.edges, gabow.adj_start, matching)
 
     print(f"Matching size: {len(matching)}")
     if greedy_mode > 0:
@@ -9,7 +9,6 @@ import time
 from bisect import bisect_left
 
 NIL = -1
-INF = float('inf')
 
 
 class HopcroftKarp:
@@ -26,47 +25,117 @@ class HopcroftKarp:
         self.pair_left = [NIL] * left_count
         self.pair_right = [NIL] * right_count
         self.dist = [0] * (left_count + 1)
+        # int "infinite" distance: BFS layers never exceed left_count, and
+        # int-int compares avoid the mixed int/float path of float('inf')
+        self.inf = left_count + 1
+        # dfs stack, one list per field, indexed by a top counter: left
+        # vertex, iterator over its remaining neighbors, its dist + 1, and
+        # the right vertex taken. dist rises by one per level, so the
+        # depth is at most left_count + 1.
+        self.ds_u = [0] * (left_count + 1)
+        self.ds_it = [None] * (left_count + 1)
+        self.ds_du = [0] * (left_count + 1)
+        self.ds_v = [0] * (left_count + 1)
+        # BFS queue: only left vertices are enqueued, each at most once per
+        # phase, so left_count slots with head/tail indices suffice
+        self.bfs_q = [0] * left_count
 
     def bfs(self):
-        queue = []
-        qi = 0
-
-        for u in range(self.left_count):
-            if self.pair_left[u] == NIL:
-                self.dist[u] = 0
-                queue.append(u)
+        lc = self.left_count
+        graph = self.graph
+        pair_right = self.pair_right
+        dist = self.dist
+        inf = self.inf
+        queue = self.bfs_q
+        head = 0
+        tail = 0
+
+        for u, v in enumerate(self.pair_left):
+            if v == NIL:
+                dist[u] = 0
+                queue[tail] = u
+                tail += 1
             else:
-                self.dist[u] = INF
-
-        self.dist[self.left_count] = INF
-
-        while qi < len(queue):
-            u = queue[qi]
-            qi += 1
-            if self.dist[u] < self.dist[self.left_count]:
-                for v in self.graph[u]:
-                    paired = self.left_count if self.pair_right[v] == NIL else self.pair_right[v]
-                    if self.dist[paired] == INF:
-                        self.dist[paired] = self.dist[u] + 1
-                        if self.pair_right[v] != NIL:
-                            queue.append(self.pair_right[v])
-
-        return self.dist[self.left_count] != INF
-
-    def dfs(self, u):
-        if u == NIL:
-            return True
-
-        for v in self.graph[u]:
-            paired = self.left_count if self.pair_right[v] == NIL else self.pair_right[v]
-            if self.dist[paired] == self.dist[u] + 1:
-                if self.dfs(self.pair_right[v]):
-                    self.pair_right[v] = u
-                    self.pair_left[u] = v
-                    return True
-
-        self.dist[u] = INF
-        return False
+                dist[u] = inf
+
+        dist[lc] = inf
+
+        while head < tail:
+            u = queue[head]
+            head += 1
+            du = dist[u]
+            if du < dist[lc]:
+                du += 1
+                for v in graph[u]:
+                    pv = pair_right[v]
+                    paired = lc if pv == NIL else pv
+                    if dist[paired] == inf:
+                        dist[paired] = du
+                        if pv != NIL:
+                            queue[tail] = pv
+                            tail += 1
+
+        return dist[lc] != inf
+
+    def dfs_phase(self):
+        """Run the layered DFS from every free left vertex, in id order,
+        augmenting along each path found."""
+        # Iterative: an augmenting path can be O(sqrt(V)) long or more,
+        # which would cost a Python frame per step and can overrun the
+        # recursion limit on large graphs. Each frame keeps a list
+        # iterator, so a resumed scan picks up where it stopped with no
+        # index arithmetic; the current frame lives in locals and the
+        # stack lists are only touched on a push or a pop. Everything is
+        # bound once per phase rather than once per root.
+        lc = self.left_count
+        graph = self.graph
+        pair_left = self.pair_left
+        pair_right = self.pair_right
+        dist = self.dist
+        inf = self.inf
+        su = self.ds_u
+        sit = self.ds_it
+        sdu = self.ds_du
+        sv = self.ds_v
+        for root in range(lc):
+            if pair_left[root] != NIL:
+                continue
+            top = 0
+            u = root
+            it = iter(graph[u])
+            du = dist[u] + 1
+            while True:
+                for v in it:
+                    pv = pair_right[v]
+                    if dist[lc if pv == NIL else pv] == du:
+                        break
+                else:
+                    # No neighbor leads to a free vertex: drop u this phase
+                    dist[u] = inf
+                    if top == 0:
+                        break
+                    top -= 1
+                    u = su[top]
+                    it = sit[top]
+                    du = sdu[top]
+                    continue
+                su[top] = u
+                sv[top] = v
+                if pv == NIL:
+                    # Reached a free right vertex: flip the whole path
+                    for k in range(top + 1):
+                        a = su[k]
+                        b = sv[k]
+                        pair_left[a] = b
+                        pair_right[b] = a
+                    break
+                sit[top] = it
+                sdu[top] = du
+                top += 1
+                # dist[pv] == du, so pv's neighbors are tried at du + 1
+                u = pv
+                it = iter(graph[u])
+                du += 1
 
     def maximum_matching(self, greedy_mode=0):
         if greedy_mode == 1:
@@ -75,16 +144,9 @@ class HopcroftKarp:
             self.greedy_size = self._greedy_init_md()
 
         while self.bfs():
-            for u in range(self.left_count):
-                if self.pair_left[u] == NIL:
-                    self.dfs(u)
+            self.dfs_phase()
 
-        matching = []
-        for u in range(self.left_count):
-            if self.pair_left[u] != NIL:
-                matching.append((u, self.pair_left[u]))
-        matching.sort()
-        return matching
+        return [(u, v) for u, v in enumerate(self.pair_left) if v != NIL]
 
     greedy_size = 0
 
@@ -112,16 +174,19 @@ class HopcroftKarp:
                 rdeg[v] += 1
         # Compute left-side degrees
         ldeg = [len(self.graph[u]) for u in range(lc)]
-        order = sorted(range(lc), key=lambda x: (ldeg[x], x))
+        order = sorted(range(lc), key=ldeg.__getitem__)
+        deg_cap = max(rdeg, default=0) + 1  # int sentinel above every rdeg
         for u in order:
             if self.pair_left[u] != NIL:
                 continue
             best = NIL
-            best_deg = float('inf')
+            best_deg = deg_cap
             for v in self.graph[u]:
                 if self.pair_right[v] == NIL and rdeg[v] < best_deg:
                     best = v
                     best_deg = rdeg[v]
+                    if best_deg == 1:
+                        break
             if best >= 0:
                 self.pair_left[u] = best
                 self.pair_right[best] = u
@@ -142,17 +207,21 @@ def validate_matching(left_count, right_count, graph, matching):
         left_deg[u] += 1
         right_deg[v] += 1
 
-    for i in range(left_count):
-        if left_deg[i] > 1:
-            print(f"ERROR: Left vertex {i} in {left_deg[i]} edges!", file=sys.stderr)
-            errors += 1
-    for i in range(right_count):
-        if right_deg[i] > 1:
-            print(f"ERROR: Right vertex {i} in {right_deg[i]} edges!", file=sys.stderr)
-            errors += 1
-
-    matched_left = sum(1 for d in left_deg if d > 0)
-    matched_right = sum(1 for d in right_deg if d > 0)
+    # max() and count() run in C; the per-vertex scans only run to
+    # report an actual violation
+    if max(left_deg, default=0) > 1:
+        for i in range(left_count):
+            if left_deg[i] > 1:
+                print(f"ERROR: Left vertex {i} in {left_deg[i]} edges!", file=sys.stderr)
+                errors += 1
+    if max(right_deg, default=0) > 1:
+        for i in range(right_count):
+            if right_deg[i] > 1:
+                print(f"ERROR: Right vertex {i} in {right_deg[i]} edges!", file=sys.stderr)
+                errors += 1
+
+    matched_left = left_count - left_deg.count(0)
+    matched_right = right_count - right_deg.count(0)
 
     print()
     print("=== Validation Report ===")
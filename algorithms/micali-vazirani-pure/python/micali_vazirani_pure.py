@@ -19,75 +19,6 @@ DDFS_PETAL = 1
 DDFS_PATH  = 2
 
 
-# =========================================================================
-# Node
-# =========================================================================
-class Node:
-    __slots__ = (
-        'preds', 'pred_to', 'hanging_bridges',
-        'min_level', 'max_level', 'even_level', 'odd_level',
-        'match', 'bud', 'above', 'below',
-        'ddfs_green', 'ddfs_red', 'number_preds',
-        'deleted', 'visited',
-    )
-
-    def __init__(self):
-        self.preds = []
-        self.pred_to = []          # list of (target, index in target's preds)
-        self.hanging_bridges = []
-        self.min_level = NIL
-        self.max_level = NIL
-        self.even_level = NIL
-        self.odd_level = NIL
-        self.match = NIL
-        self.bud = NIL
-        self.above = NIL
-        self.below = NIL
-        self.ddfs_green = NIL
-        self.ddfs_red = NIL
-        self.number_preds = 0
-        self.deleted = False
-        self.visited = False
-
-    def set_min_level(self, level):
-        self.min_level = level
-        if level % 2:
-            self.odd_level = level
-        else:
-            self.even_level = level
-
-    def set_max_level(self, level):
-        self.max_level = level
-        if level % 2:
-            self.odd_level = level
-        else:
-            self.even_level = level
-
-    def outer(self):
-        return (self.even_level != NIL and
-                (self.odd_level == NIL or self.even_level < self.odd_level))
-
-    def inner(self):
-        return not self.outer()
-
-    def reset(self):
-        self.preds.clear()
-        self.pred_to.clear()
-        self.hanging_bridges.clear()
-        self.min_level = NIL
-        self.max_level = NIL
-        self.even_level = NIL
-        self.odd_level = NIL
-        self.bud = NIL
-        self.above = NIL
-        self.below = NIL
-        self.ddfs_green = NIL
-        self.ddfs_red = NIL
-        self.number_preds = 0
-        self.deleted = False
-        self.visited = False
-
-
 # =========================================================================
 # DDFSResult
 # =========================================================================
@@ -104,7 +35,25 @@ class DDFSResult:
 # =========================================================================
 class MVGraph:
     def __init__(self):
-        self.nodes = []
+        # Per-vertex state is stored field by field (one list per field,
+        # indexed by vertex) rather than as one object per vertex
+        self.n = 0
+        self.preds = []
+        self.pred_to = []          # per vertex: (target, index in target's preds)
+        self.hanging_bridges = []
+        self.min_level = []
+        self.max_level = []
+        self.even_level = []
+        self.odd_level = []
+        self.match = []
+        self.bud = []
+        self.above = []
+        self.below = []
+        self.ddfs_green = []
+        self.ddfs_red = []
+        self.number_preds = []
+        self.deleted = bytearray()
+        self.visited = bytearray()
         self.edges = []          # flat adjacency (CSR values)
         self.adj_start = []
         self.deg = []
@@ -120,7 +69,9 @@ class MVGraph:
 
     # ---- construction ----
     def build(self, n, edge_list):
-        self.nodes = [Node() for _ in range(n)]
+        self.n = n
+        self.match = [NIL] * n
+        self.reset_nodes()
         adj = [[] for _ in range(n)]
         for u, v in edge_list:
             if 0 <= u < n and 0 <= v < n and u != v:
@@ -141,36 +92,39 @@ class MVGraph:
     greedy_size = 0
 
     def greedy_init(self):
-        n = len(self.nodes)
+        n = self.n
         cnt = 0
         for j in range(n):
-            if self.nodes[j].match == NIL:
+            if self.match[j] == NIL:
                 for k in range(self.deg[j]):
                     i = self.edges[self.adj_start[j] + k]
-                    if self.nodes[i].match == NIL:
-                        self.nodes[j].match = i
-                        self.nodes[i].match = j
+                    if self.match[i] == NIL:
+                        self.match[j] = i
+                        self.match[i] = j
                         self.matchnum += 1
                         cnt += 1
                         break
         return cnt
 
     def greedy_init_md(self):
-        n = len(self.nodes)
+        n = self.n
         cnt = 0
-        order = sorted(range(n), key=lambda x: (self.deg[x], x))
+        order = sorted(range(n), key=self.deg.__getitem__)
+        deg_cap = len(self.edges) + 1  # int sentinel above every degree
         for j in order:
-            if self.nodes[j].match == NIL:
+            if self.match[j] == NIL:
                 best = NIL
-                best_deg = float('inf')
+                best_deg = deg_cap
                 for k in range(self.deg[j]):
                     i = self.edges[self.adj_start[j] + k]
-                    if self.nodes[i].match == NIL and self.deg[i] < best_deg:
+                    if self.match[i] == NIL and self.deg[i] < best_deg:
                         best = i
                         best_deg = self.deg[i]
+                        if best_deg == 1:
+                            break
                 if best != NIL:
-                    self.nodes[j].match = best
-                    self.nodes[best].match = j
+                    self.match[j] = best
+                    self.match[best] = j
                     self.matchnum += 1
                     cnt += 1
         return cnt
@@ -189,16 +143,16 @@ class MVGraph:
         self.bridgenum += 1
 
     def tenacity(self, n1, n2):
-        if self.nodes[n1].match == n2:  # matched bridge
-            if self.nodes[n1].odd_level != NIL and self.nodes[n2].odd_level != NIL:
-                return self.nodes[n1].odd_level + self.nodes[n2].odd_level + 1
+        if self.match[n1] == n2:  # matched bridge
+            if self.odd_level[n1] != NIL and self.odd_level[n2] != NIL:
+                return self.odd_level[n1] + self.odd_level[n2] + 1
         else:  # unmatched bridge
-            if self.nodes[n1].even_level != NIL and self.nodes[n2].even_level != NIL:
-                return self.nodes[n1].even_level + self.nodes[n2].even_level + 1
+            if self.even_level[n1] != NIL and self.even_level[n2] != NIL:
+                return self.even_level[n1] + self.even_level[n2] + 1
         return NIL
 
     def bud_star(self, c):
-        b = self.nodes[c].bud
+        b = self.bud[c]
         if b == NIL:
             return c
         return self.bud_star(b)
@@ -206,11 +160,56 @@ class MVGraph:
     def bud_star_includes(self, c, goal):
         if c == goal:
             return True
-        b = self.nodes[c].bud
+        b = self.bud[c]
         if b == NIL:
             return False
         return self.bud_star_includes(b, goal)
 
+    # ---- per-vertex state ----
+    def reset_nodes(self):
+        # Scalar fields are rebuilt whole; the per-vertex lists are cleared
+        # in place (fresh ones would churn the GC every phase). match is
+        # kept across phases.
+        n = self.n
+        if len(self.preds) != n:
+            self.preds = [[] for _ in range(n)]
+            self.pred_to = [[] for _ in range(n)]
+            self.hanging_bridges = [[] for _ in range(n)]
+        else:
+            for field in (self.preds, self.pred_to, self.hanging_bridges):
+                for lst in field:
+                    lst.clear()
+        self.min_level = [NIL] * n
+        self.max_level = [NIL] * n
+        self.even_level = [NIL] * n
+        self.odd_level = [NIL] * n
+        self.bud = [NIL] * n
+        self.above = [NIL] * n
+        self.below = [NIL] * n
+        self.ddfs_green = [NIL] * n
+        self.ddfs_red = [NIL] * n
+        self.number_preds = [0] * n
+        self.deleted = bytearray(n)
+        self.visited = bytearray(n)
+
+    def set_min_level(self, v, level):
+        self.min_level[v] = level
+        if level % 2:
+            self.odd_level[v] = level
+        else:
+            self.even_level[v] = level
+
+    def set_max_level(self, v, level):
+        self.max_level[v] = level
+        if level % 2:
+            self.odd_level[v] = level
+        else:
+            self.even_level[v] = level
+
+    def outer(self, v):
+        el = self.even_level[v]
+        return el != NIL and (self.odd_level[v] == NIL or el < self.odd_level[v])
+
     # ---- reset between phases ----
     def phase_reset(self):
         for v in self.levels:
@@ -219,30 +218,29 @@ class MVGraph:
             v.clear()
         self.bridgenum = 0
         self.todonum = 0
-        n = len(self.nodes)
-        for i in range(n):
-            self.nodes[i].reset()
-            if self.nodes[i].match == NIL:
+        self.reset_nodes()
+        for i in range(self.n):
+            if self.match[i] == NIL:
                 self.add_to_level(0, i)
-                self.nodes[i].set_min_level(0)
+                self.set_min_level(i, 0)
 
     # ---- step_to: core level-building step ----
     def step_to(self, to, frm, level):
         level += 1
-        tl = self.nodes[to].min_level
+        tl = self.min_level[to]
         if tl == NIL or tl >= level:
             if tl != level:
                 self.add_to_level(level, to)
-                self.nodes[to].set_min_level(level)
-            self.nodes[to].preds.append(frm)
-            self.nodes[to].number_preds += 1
-            self.nodes[frm].pred_to.append((to, len(self.nodes[to].preds) - 1))
+                self.set_min_level(to, level)
+            self.preds[to].append(frm)
+            self.number_preds[to] += 1
+            self.pred_to[frm].append((to, len(self.preds[to]) - 1))
         else:
             # found a bridge
             ten = self.tenacity(to, frm)
             if ten == NIL:
-                self.nodes[to].hanging_bridges.append(frm)
-                self.nodes[frm].hanging_bridges.append(to)
+                self.hanging_bridges[to].append(frm)
+                self.hanging_bridges[frm].append(to)
             else:
                 self.add_to_bridges((ten - 1) // 2, to, frm)
 
@@ -255,15 +253,15 @@ class MVGraph:
             current = self.levels[i][k]
             k += 1
             self.todonum -= 1
-            nd = self.nodes[current]
+            mc = self.match[current]
             if i % 2 == 0:
                 for j in range(self.deg[current]):
                     edge = self.edges[self.adj_start[current] + j]
-                    if edge != nd.match:
+                    if edge != mc:
                         self.step_to(edge, current, i)
             else:
-                if nd.match != NIL:
-                    self.step_to(nd.match, current, i)
+                if mc != NIL:
+                    self.step_to(mc, current, i)
 
     # ---- MAX phase ----
     def MAX(self, i):
@@ -276,7 +274,7 @@ class MVGraph:
             n1, n2 = self.bridges[i][j]
             j += 1
             self.bridgenum -= 1
-            if self.nodes[n1].deleted or self.nodes[n2].deleted:
+            if self.deleted[n1] or self.deleted[n2]:
                 continue
 
             result = self.DDFS(n1, n2)
@@ -286,7 +284,7 @@ class MVGraph:
             if result == DDFS_PATH:
                 self.find_path(n1, n2)
                 self.augment_path()
-                if len(self.nodes) // 2 <= self.matchnum:
+                if self.n // 2 <= self.matchnum:
                     return True
                 self.remove_path()
                 found = True
@@ -294,10 +292,10 @@ class MVGraph:
                 b = self.last_ddfs.bottleneck
                 current_ten = i * 2 + 1
                 for itt in list(self.last_ddfs.nodes_seen):
-                    self.nodes[itt].bud = b
-                    self.nodes[itt].set_max_level(current_ten - self.nodes[itt].min_level)
-                    self.add_to_level(self.nodes[itt].max_level, itt)
-                    for hanging in self.nodes[itt].hanging_bridges:
+                    self.bud[itt] = b
+                    self.set_max_level(itt, current_ten - self.min_level[itt])
+                    self.add_to_level(self.max_level[itt], itt)
+                    for hanging in self.hanging_bridges[itt]:
                         hanging_ten = self.tenacity(itt, hanging)
                         if hanging_ten != NIL:
                             self.add_to_bridges((hanging_ten - 1) // 2, itt, hanging)
@@ -308,14 +306,14 @@ class MVGraph:
     # ==================================================================
 
     def add_pred_to_stack(self, cur, stack):
-        for pred in self.nodes[cur].preds:
+        for pred in self.preds[cur]:
             if pred != NIL:
                 stack.append((cur, pred))
 
     def prepare_next(self, nx):
         """nx is [first, second]; mutated in place."""
         if nx[0] != NIL:
-            self.nodes[nx[0]].below = nx[1]
+            self.below[nx[0]] = nx[1]
         nx[1] = self.bud_star(nx[1])
 
     @staticmethod
@@ -335,20 +333,20 @@ class MVGraph:
 
     def L(self, e):
         n = self.bud_star(e[1])
-        return self.nodes[n].min_level
+        return self.min_level[n]
 
     def step_into(self, C_ref, nx, S, green_top, red_top):
         """C_ref is [value]; nx is [first, second]. Mutated in place."""
         self.prepare_next(nx)
-        if not self.nodes[nx[1]].visited:
-            self.nodes[nx[1]].above = nx[0]
-            C_ref[0] = nx[1]
-            nd = self.nodes[C_ref[0]]
-            nd.visited = True
-            nd.ddfs_green = green_top
-            nd.ddfs_red = red_top
-            self.last_ddfs.nodes_seen.append(C_ref[0])
-            self.add_pred_to_stack(C_ref[0], S)
+        if not self.visited[nx[1]]:
+            c = nx[1]
+            self.above[c] = nx[0]
+            C_ref[0] = c
+            self.visited[c] = 1
+            self.ddfs_green[c] = green_top
+            self.ddfs_red[c] = red_top
+            self.last_ddfs.nodes_seen.append(c)
+            self.add_pred_to_stack(c, S)
         self.node_from_stack(nx, S)
 
     def DDFS(self, green_top, red_top):
@@ -365,7 +363,7 @@ class MVGraph:
 
         if self.bud_star(red_top) == self.bud_star(green_top):
             return DDFS_EMPTY
-        if self.nodes[green_top].min_level == 0 and self.nodes[red_top].min_level == 0:
+        if self.min_level[green_top] == 0 and self.min_level[red_top] == 0:
             return DDFS_PATH
 
         Ng = [NIL, green_top]
@@ -374,7 +372,7 @@ class MVGraph:
         green_before = [NIL, NIL]
 
         while (R[0] == NIL or G[0] == NIL or
-               self.nodes[R[0]].min_level > 0 or self.nodes[G[0]].min_level > 0):
+               self.min_level[R[0]] > 0 or self.min_level[G[0]] > 0):
 
             while self.edge_valid(Nr) and self.edge_valid(Ng) and self.L(Nr) != self.L(Ng):
 
@@ -385,15 +383,15 @@ class MVGraph:
                     Nr[0] = red_before[0]
                     Nr[1] = red_before[1]
                     tmp = red_before[0]
-                    while self.nodes[tmp].above != NIL:
-                        rc = self.nodes[tmp].above
-                        for ri in self.nodes[rc].preds:
+                    while self.above[tmp] != NIL:
+                        rc = self.above[tmp]
+                        for ri in self.preds[rc]:
                             if ri == NIL:
                                 continue
                             if self.bud_star(ri) == tmp:
-                                self.nodes[rc].below = ri
+                                self.below[rc] = ri
                                 break
-                        tmp = self.nodes[tmp].above
+                        tmp = self.above[tmp]
 
                 while self.edge_valid(Ng) and self.L(Nr) < self.L(Ng):
                     self.step_into(G, Ng, Sg, green_top, red_top)
@@ -402,15 +400,15 @@ class MVGraph:
                     Ng[0] = green_before[0]
                     Ng[1] = green_before[1]
                     tmp = green_before[0]
-                    while self.nodes[tmp].above != NIL:
-                        rc = self.nodes[tmp].above
-                        for ri in self.nodes[rc].preds:
+                    while self.above[tmp] != NIL:
+                        rc = self.above[tmp]
+                        for ri in self.preds[rc]:
                             if ri == NIL:
                                 continue
                             if self.bud_star(ri) == tmp:
-                                self.nodes[rc].below = ri
+                                self.below[rc] = ri
                                 break
-                        tmp = self.nodes[tmp].above
+                        tmp = self.above[tmp]
 
             if self.bud_star(Nr[1]) == self.bud_star(Ng[1]):
                 if Sr:
@@ -457,34 +455,34 @@ class MVGraph:
     def walk_down_path(self, start):
         cur = start
         while cur != NIL:
-            if self.nodes[cur].bud != NIL:
+            if self.bud[cur] != NIL:
                 cur = self.walk_blossom(cur)
             else:
                 self.path_found.append(cur)
-                cur = self.nodes[cur].below
+                cur = self.below[cur]
 
     def jump_bridge(self, cur):
-        if self.nodes[cur].ddfs_green == cur:
-            return self.nodes[cur].ddfs_red
-        if self.nodes[cur].ddfs_red == cur:
-            return self.nodes[cur].ddfs_green
-        if self.bud_star_includes(self.nodes[cur].ddfs_green, cur):
+        if self.ddfs_green[cur] == cur:
+            return self.ddfs_red[cur]
+        if self.ddfs_red[cur] == cur:
+            return self.ddfs_green[cur]
+        if self.bud_star_includes(self.ddfs_green[cur], cur):
             before = len(self.path_found)
-            b = self.nodes[cur].ddfs_green
+            b = self.ddfs_green[cur]
             while b != cur:
                 b = self.walk_blossom(b)
             self.path_found[before:] = self.path_found[before:][::-1]
-            return self.nodes[cur].ddfs_red
+            return self.ddfs_red[cur]
         else:
             before = len(self.path_found)
-            b = self.nodes[cur].ddfs_red
+            b = self.ddfs_red[cur]
             while b != cur:
                 b = self.walk_blossom(b)
             self.path_found[before:] = self.path_found[before:][::-1]
-            return self.nodes[cur].ddfs_green
+            return self.ddfs_green[cur]
 
     def walk_blossom(self, cur):
-        if self.nodes[cur].outer():
+        if self.outer(cur):
             cur = self.walk_blossom_down(cur, NIL)
         else:
             cur = self.walk_blossom_up(cur)
@@ -496,28 +494,28 @@ class MVGraph:
     def walk_blossom_down(self, cur, before):
         if before == NIL:
             before = cur
-        b = self.nodes[cur].bud
+        b = self.bud[cur]
         while cur != NIL and cur != b:
-            if (self.nodes[cur].ddfs_green != self.nodes[before].ddfs_green or
-                    self.nodes[cur].ddfs_red != self.nodes[before].ddfs_red):
+            if (self.ddfs_green[cur] != self.ddfs_green[before] or
+                    self.ddfs_red[cur] != self.ddfs_red[before]):
                 cur = self.walk_blossom(cur)
             else:
                 self.path_found.append(cur)
-                cur = self.nodes[cur].below
+                cur = self.below[cur]
         return cur
 
     def walk_blossom_up(self, cur):
         while True:
             self.path_found.append(cur)
-            if self.nodes[cur].above == NIL:
+            if self.above[cur] == NIL:
                 break
-            b = self.nodes[self.nodes[cur].above].below
+            b = self.below[self.above[cur]]
             if b != cur and self.bud_star_includes(b, cur):
                 before = len(self.path_found)
                 while b != cur:
                     b = self.walk_blossom(b)
                 self.path_found[before:] = self.path_found[before:][::-1]
-            cur = self.nodes[cur].above
+            cur = self.above[cur]
         return cur
 
     def augment_path(self):
@@ -525,31 +523,30 @@ class MVGraph:
         while i + 1 < len(self.path_found):
             n1 = self.path_found[i]
             n2 = self.path_found[i + 1]
-            self.nodes[n1].match = n2
-            self.nodes[n2].match = n1
+            self.match[n1] = n2
+            self.match[n2] = n1
             i += 2
         self.matchnum += 1
 
     def remove_path(self):
         while self.path_found:
             current = self.path_found.pop()
-            if not self.nodes[current].deleted:
-                self.nodes[current].deleted = True
-                for tgt, idx in self.nodes[current].pred_to:
-                    nd = self.nodes[tgt]
-                    if not nd.deleted:
-                        nd.preds[idx] = NIL
-                        nd.number_preds -= 1
-                        if nd.number_preds <= 0:
+            if not self.deleted[current]:
+                self.deleted[current] = 1
+                for tgt, idx in self.pred_to[current]:
+                    if not self.deleted[tgt]:
+                        self.preds[tgt][idx] = NIL
+                        self.number_preds[tgt] -= 1
+                        if self.number_preds[tgt] <= 0:
                             self.path_found.append(tgt)
 
     # ---- main matching driver ----
     def max_match(self):
-        n = len(self.nodes)
+        n = self.n
         for i in range(n):
-            if self.nodes[i].match == NIL:
+            if self.match[i] == NIL:
                 self.add_to_level(0, i)
-                self.nodes[i].set_min_level(0)
+                self.set_min_level(i, 0)
 
         found = self.max_match_phase()
         while n // 2 > self.matchnum and found:
@@ -557,7 +554,7 @@ class MVGraph:
             found = self.max_match_phase()
 
     def max_match_phase(self):
-        n = len(self.nodes)
+        n = self.n
         found = False
         for i in range(n // 2 + 1):
             if found:
@@ -570,10 +567,10 @@ class MVGraph:
 
     def get_matching(self):
         result = []
-        n = len(self.nodes)
+        n = self.n
         for i in range(n):
-            if self.nodes[i].match != NIL and self.nodes[i].match > i:
-                result.append((i, self.nodes[i].match))
+            if self.match[i] != NIL and self.match[i] > i:
+                result.append((i, self.match[i]))
         return result
 
 